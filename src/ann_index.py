@@ -0,0 +1,231 @@
+import argparse
+import sys
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from compact_embeddings import CompactEmbeddings, normalize_rows
+from job import Job
+
+
+KMEANS_TRAIN_SAMPLE = 65536
+
+
+def default_n_lists(n: int) -> int:
+    return max(1, int(4 * np.sqrt(max(n, 1))))
+
+
+def spherical_kmeans(
+    embeddings: np.ndarray,
+    n_clusters: int,
+    n_iter: int = 20,
+    seed: int = 0,
+    block_size: int = 16384
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    n_clusters = min(n_clusters, len(embeddings))
+    centroids = embeddings[rng.choice(len(embeddings), n_clusters, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assignments = assign_to_centroids(embeddings, centroids, block_size)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, embeddings)
+        counts = np.bincount(assignments, minlength=n_clusters)
+
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = embeddings[rng.choice(len(embeddings), int(empty.sum()), replace=False)]
+        centroids = normalize_rows(sums)
+
+    return centroids.astype(np.float32)
+
+
+def assign_to_centroids(embeddings: np.ndarray, centroids: np.ndarray, block_size: int = 16384) -> np.ndarray:
+    assignments = np.empty(len(embeddings), dtype=np.int64)
+    for start in range(0, len(embeddings), block_size):
+        block = embeddings[start:start + block_size]
+        assignments[start:start + block_size] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    if k >= len(scores):
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+class IVFIndex:
+    """Inverted-file index over unit-length embeddings.
+
+    Vectors are clustered with spherical k-means; a query only scores the
+    vectors in its ``nprobe`` closest clusters, so search touches roughly
+    ``nprobe / n_lists`` of the corpus.
+    """
+
+    def __init__(self, centroids: np.ndarray, storage: str = "float32", nprobe: int = 8):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.storage = storage
+        self.nprobe = nprobe
+        self.vectors = CompactEmbeddings.from_dense(np.zeros((0, self.centroids.shape[1]), dtype=np.float32), storage)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.assignments = np.zeros(0, dtype=np.int64)
+        self._lists: Optional[List[np.ndarray]] = None
+
+    @classmethod
+    def build(
+        cls,
+        embeddings: np.ndarray,
+        ids: Optional[Sequence[int]] = None,
+        n_lists: Optional[int] = None,
+        storage: str = "float32",
+        nprobe: int = 8,
+        n_iter: int = 20,
+        seed: int = 0
+    ) -> "IVFIndex":
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        n_lists = n_lists or default_n_lists(len(embeddings))
+
+        rng = np.random.default_rng(seed)
+        sample = embeddings
+        if len(embeddings) > KMEANS_TRAIN_SAMPLE:
+            sample = embeddings[rng.choice(len(embeddings), KMEANS_TRAIN_SAMPLE, replace=False)]
+
+        index = cls(spherical_kmeans(sample, n_lists, n_iter, seed), storage, nprobe)
+        index.add(embeddings, ids)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    def add(self, embeddings: np.ndarray, ids: Optional[Sequence[int]] = None) -> None:
+        embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        if ids is None:
+            start = int(self.ids.max()) + 1 if len(self.ids) else 0
+            ids = np.arange(start, start + len(embeddings))
+        ids = np.asarray(ids, dtype=np.int64)
+
+        self.vectors.append(embeddings)
+        self.ids = np.concatenate((self.ids, ids))
+        self.assignments = np.concatenate((self.assignments, assign_to_centroids(embeddings, self.centroids)))
+        self._lists = None
+
+    def _inverted_lists(self) -> List[np.ndarray]:
+        if self._lists is None:
+            order = np.argsort(self.assignments, kind="stable")
+            bounds = np.searchsorted(self.assignments[order], np.arange(self.n_lists + 1))
+            self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(self.n_lists)]
+        return self._lists
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        if len(self) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        nprobe = min(nprobe or self.nprobe, self.n_lists)
+        probes = _top_k(self.centroids @ query, nprobe)
+
+        lists = self._inverted_lists()
+        rows = np.concatenate([lists[p] for p in probes])
+        if len(rows) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        scores = self.vectors.cosine(query, rows=rows)
+        top = _top_k(scores, k)
+        return self.ids[rows[top]], scores[top]
+
+    def save(self, path: str) -> None:
+        np.savez(
+            path,
+            centroids=self.centroids,
+            data=self.vectors.data,
+            scales=self.vectors.scales if self.vectors.scales is not None else np.zeros(0, dtype=np.float32),
+            ids=self.ids,
+            assignments=self.assignments,
+            storage=np.array(self.storage),
+            nprobe=np.array(self.nprobe)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        with np.load(path) as f:
+            index = cls(f["centroids"], str(f["storage"]), int(f["nprobe"]))
+            scales = f["scales"] if index.storage == "int8" else None
+            index.vectors = CompactEmbeddings(f["data"], index.storage, scales=scales)
+            index.ids = f["ids"]
+            index.assignments = f["assignments"]
+        return index
+
+
+def build_job_index(jobs: Sequence[Job], storage: str = "float32", nprobe: int = 8) -> IVFIndex:
+    from similarities import encode_texts
+
+    embeddings = encode_texts([job.requirements for job in jobs])
+    return IVFIndex.build(embeddings, np.arange(len(jobs)), storage=storage, nprobe=nprobe)
+
+
+def recall_at_k(
+    index: IVFIndex,
+    embeddings: np.ndarray,
+    ids: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    nprobes: Sequence[int] = (1, 2, 4, 8, 16, 32)
+) -> List[dict]:
+    start = time.perf_counter()
+    exact = [set(ids[_top_k(embeddings @ q, k)]) for q in queries]
+    brute_ms = (time.perf_counter() - start) * 1000 / max(len(queries), 1)
+
+    rows = []
+    for nprobe in nprobes:
+        if nprobe > index.n_lists:
+            continue
+        start = time.perf_counter()
+        found = [set(index.search(q, k, nprobe)[0]) for q in queries]
+        search_ms = (time.perf_counter() - start) * 1000 / max(len(queries), 1)
+        recall = np.mean([len(a & b) / max(len(a), 1) for a, b in zip(exact, found)])
+        rows.append({
+            "nprobe": nprobe,
+            f"recall@{k}": float(recall),
+            "scanned_fraction": nprobe / index.n_lists,
+            "search_ms": search_ms,
+            "brute_force_ms": brute_ms,
+        })
+    return rows
+
+
+def _synthetic_embeddings(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    topics = normalize_rows(rng.standard_normal((max(8, n // 200), dim)).astype(np.float32))
+    noise = 0.05 * rng.standard_normal((n, dim)).astype(np.float32)
+    return normalize_rows(topics[rng.integers(0, len(topics), n)] + noise)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Recall@k of the IVF job index against brute force.")
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--storage", choices=("float32", "float16", "int8"), default="float32")
+    args = parser.parse_args(argv)
+
+    embeddings = _synthetic_embeddings(args.n + args.queries, args.dim)
+    corpus, queries = embeddings[:args.n], embeddings[args.n:]
+    ids = np.arange(args.n)
+
+    start = time.perf_counter()
+    index = IVFIndex.build(corpus, ids, storage=args.storage)
+    print(f"built {index.n_lists} lists over {len(index)} vectors in {time.perf_counter() - start:.2f}s")
+
+    for row in recall_at_k(index, corpus, ids, queries, args.k):
+        print("  ".join(f"{key}={value:.4f}" if isinstance(value, float) else f"{key}={value}" for key, value in row.items()))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
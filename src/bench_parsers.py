@@ -0,0 +1,101 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+import bs4
+from lxml import etree
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from listing_parser import FIXTURE_DIR, LISTING_PARSERS, check_fixtures, fixture_files, load_fixture
+
+
+def _load_pages(fixture_dir: str) -> List[bytes]:
+    return [load_fixture(name, fixture_dir) for name in fixture_files(fixture_dir)]
+
+
+def run_one(name: str, pages: Sequence[bytes], repeat: int, track_memory: bool, fixture_dir: str) -> Dict:
+    # Peak memory is tracemalloc's view of the Python heap, which is where BeautifulSoup's
+    # tree lives; lxml builds its tree in C, so only its per-card Python objects show up.
+    parse = LISTING_PARSERS[name]
+    cards = sum(len(parse(content, "bench")) for content in pages)  # warm-up
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for content in pages:
+            parse(content, "bench")
+    wall_s = time.perf_counter() - start
+
+    peak = None
+    if track_memory:
+        tracemalloc.start()
+        for content in pages:
+            parse(content, "bench")
+        peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+
+    n_pages = len(pages) * repeat
+    return {
+        "parser": name,
+        "pages": n_pages,
+        "cards": cards * repeat,
+        "wall_s": wall_s,
+        "ms_per_page": wall_s * 1000 / n_pages if n_pages else 0.0,
+        "cards_per_s": cards * repeat / wall_s if wall_s else 0.0,
+        "python_peak_mb": peak,
+        "mismatches": len(check_fixtures(parse, fixture_dir)),
+    }
+
+
+def run_benchmark(
+    parsers: Sequence[str] = tuple(LISTING_PARSERS),
+    fixture_dir: str = FIXTURE_DIR,
+    repeat: int = 20,
+    track_memory: bool = True
+) -> Dict:
+    pages = _load_pages(fixture_dir)
+    runs = [run_one(name, pages, repeat, track_memory, fixture_dir) for name in parsers]
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "bs4": bs4.__version__,
+        "lxml": ".".join(map(str, etree.LXML_VERSION)),
+        "fixtures": fixture_files(fixture_dir),
+        "page_bytes": sum(len(content) for content in pages),
+        "repeat": repeat,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None,
+        "runs": runs,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Wuzzuf listing-page parsers on the synthetic fixtures.")
+    parser.add_argument("--parsers", nargs="+", choices=tuple(LISTING_PARSERS), default=list(LISTING_PARSERS))
+    parser.add_argument("--fixtures", default=FIXTURE_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.parsers, args.fixtures, args.repeat, not args.no_memory)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        for row in report["runs"]:
+            print("  ".join(f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}" for key, value in row.items()))
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
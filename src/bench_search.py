@@ -0,0 +1,199 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from cv_extraction import CVData
+from job_store import JobStore
+from search_algorithms import HillClimbing, LocalBeamSearch, SimulatedAnnealing, TabuSearch
+from search_engine import UNLIMITED, SearchBudget, SearchEngine
+from search_space import JobSearchSpace
+from similarities import ScoreComponents, batch_experience_similarity
+from skill_vocab import mean_over_lists
+from synthetic import synthetic_jobs
+
+
+ALGORITHMS: Dict[str, Callable] = {
+    "hill_climbing": HillClimbing,
+    "simulated_annealing": SimulatedAnnealing,
+    "local_beam_search": LocalBeamSearch,
+    "tabu_search": TabuSearch,
+}
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+BENCH_CV = CVData(raw_text="synthetic benchmark cv", skills=[], experience_years=4.0)
+
+
+def synthetic_components(store: JobStore, cv_years: float = 4.0, noise: float = 0.1, seed: int = 0) -> ScoreComponents:
+    # Each skill gets a latent relevance; jobs sharing skills get related scores, as with real embeddings.
+    rng = np.random.default_rng(seed)
+    relevance = rng.random(len(store.pool))
+    offsets = store.skill_offsets.view()
+    skill = mean_over_lists(relevance, store.skill_codes.view(), np.diff(offsets))
+    semantic = np.clip(skill + rng.normal(0.0, noise, size=len(store)), 0.0, 1.0)
+    return ScoreComponents(
+        semantic=semantic.astype(np.float32),
+        skill=skill.astype(np.float32),
+        experience=batch_experience_similarity(cv_years, store.experience_needed.view()).astype(np.float32)
+    )
+
+
+def load_components(path: str) -> ScoreComponents:
+    data = np.load(path)
+    return ScoreComponents(semantic=data["semantic"], skill=data["skill"], experience=data["experience"])
+
+
+def build_space(n: int, components: Optional[ScoreComponents] = None, seed: int = 0, **corpus) -> JobSearchSpace:
+    store = JobStore.from_jobs(synthetic_jobs(n, seed=seed, **corpus))
+    if components is None:
+        components = synthetic_components(store, BENCH_CV.experience_years, seed=seed)
+    elif len(components.semantic) != n:
+        raise ValueError(f"precomputed scores cover {len(components.semantic)} jobs, corpus has {n}")
+    return JobSearchSpace(store, BENCH_CV, components=components)
+
+
+def run_one(
+    space: JobSearchSpace,
+    name: str,
+    seed: int,
+    exact: Sequence[int],
+    track_memory: bool,
+    budget: SearchBudget = UNLIMITED
+) -> Dict:
+    engine = SearchEngine(space, budget)
+    random.seed(seed)
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    result = engine.run(ALGORITHMS[name]())
+    wall_ms = (time.perf_counter() - start) * 1000
+    peak = 0
+    if track_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    found = [space.store.id_of(job) for job in result]
+    return {
+        "algorithm": name,
+        "seed": seed,
+        "wall_ms": wall_ms,
+        "steps": engine.steps,
+        "evaluations": engine.evaluations,
+        "score_calls": engine.score_calls,
+        "neighbor_calls": engine.neighbor_calls,
+        "stop_reason": engine.stop_reason,
+        "peak_mb": peak / 2 ** 20,
+        "recall_at_3": len(set(found) & set(exact)) / max(len(exact), 1),
+        "best_score": max((space.score(i) for i in found), default=float("nan")),
+    }
+
+
+def run_benchmark(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    algorithms: Sequence[str] = tuple(ALGORITHMS),
+    seeds: Sequence[int] = tuple(range(5)),
+    scores_path: Optional[str] = None,
+    track_memory: bool = True,
+    budget: SearchBudget = UNLIMITED,
+    corpus_seed: int = 0,
+    **corpus
+) -> Dict:
+    components = load_components(scores_path) if scores_path else None
+    runs: List[Dict] = []
+    for n in sizes:
+        start = time.perf_counter()
+        space = build_space(n, components, seed=corpus_seed, **corpus)
+        build_s = time.perf_counter() - start
+        exact = [int(i) for i in space.top_ids(3)]
+
+        for name in algorithms:
+            for seed in seeds:
+                row = run_one(space, name, seed, exact, track_memory, budget)
+                row.update(size=n, build_s=build_s)
+                runs.append(row)
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "corpus": dict(corpus, seed=corpus_seed),
+        "budget": {"max_evaluations": budget.max_evaluations, "max_ms": budget.max_ms},
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None,
+        "runs": runs,
+    }
+
+
+def summarize(report: Dict) -> List[Dict]:
+    groups: Dict[tuple, List[Dict]] = {}
+    for row in report["runs"]:
+        groups.setdefault((row["size"], row["algorithm"]), []).append(row)
+
+    summary = []
+    for (size, name), rows in groups.items():
+        summary.append({
+            "size": size,
+            "algorithm": name,
+            "wall_ms": float(np.median([r["wall_ms"] for r in rows])),
+            "evaluations": float(np.mean([r["evaluations"] for r in rows])),
+            "neighbor_calls": float(np.mean([r["neighbor_calls"] for r in rows])),
+            "peak_mb": float(np.max([r["peak_mb"] for r in rows])),
+            "recall_at_3": float(np.mean([r["recall_at_3"] for r in rows])),
+        })
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the local search algorithms against the exact top-k.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--algorithms", nargs="+", choices=tuple(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument("--seeds", type=int, default=5)
+    parser.add_argument("--scores", help="npz with semantic/skill/experience arrays to use instead of synthetic scores")
+    parser.add_argument("--n-skills", type=int, default=500)
+    parser.add_argument("--n-categories", type=int, default=30)
+    parser.add_argument("--skill-exponent", type=float, default=1.1)
+    parser.add_argument("--category-exponent", type=float, default=0.8)
+    parser.add_argument("--corpus-seed", type=int, default=0)
+    parser.add_argument("--max-evaluations", type=int)
+    parser.add_argument("--max-ms", type=float)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc, which slows the runs down")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        sizes=args.sizes,
+        algorithms=args.algorithms,
+        seeds=range(args.seeds),
+        scores_path=args.scores,
+        track_memory=not args.no_memory,
+        budget=SearchBudget(max_evaluations=args.max_evaluations, max_ms=args.max_ms),
+        corpus_seed=args.corpus_seed,
+        n_skills=args.n_skills,
+        n_categories=args.n_categories,
+        skill_exponent=args.skill_exponent,
+        category_exponent=args.category_exponent
+    )
+    report["summary"] = summarize(report)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        for row in report["summary"]:
+            print("  ".join(f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}" for key, value in row.items()))
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,209 @@
+import argparse
+import sys
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+MODES = ("float32", "float16", "int8")
+DEFAULT_BLOCK_SIZE = 4096
+
+
+def normalize_rows(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+@dataclass
+class PCAProjection:
+    components: np.ndarray
+
+    @classmethod
+    def fit(cls, embeddings: np.ndarray, n_components: int) -> "PCAProjection":
+        from sklearn.decomposition import PCA
+
+        pca = PCA(n_components=n_components, svd_solver="auto", random_state=0)
+        pca.fit(embeddings)
+        return cls(components=pca.components_.astype(np.float32))
+
+    def transform(self, x: np.ndarray) -> np.ndarray:
+        # Projection without centering keeps dot products (and so cosines) comparable.
+        return normalize_rows(np.atleast_2d(x).astype(np.float32) @ self.components.T)
+
+
+class CompactEmbeddings:
+    """Unit-length embeddings stored as float32, float16 or per-vector-scaled int8.
+
+    int8 rows keep a float32 factor of ``1 / ||codes||`` so cosine scores come
+    straight out of ``codes @ query``; scoring walks the rows in blocks so only
+    one block is ever widened to float32.
+    """
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        mode: str,
+        scales: Optional[np.ndarray] = None,
+        projection: Optional[PCAProjection] = None
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown embedding mode '{mode}', expected one of {MODES}.")
+        self.data = data
+        self.mode = mode
+        self.scales = scales
+        self.projection = projection
+
+    @classmethod
+    def from_dense(
+        cls,
+        embeddings: np.ndarray,
+        mode: str = "float16",
+        pca_components: Optional[int] = None,
+        projection: Optional[PCAProjection] = None
+    ) -> "CompactEmbeddings":
+        embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+
+        if projection is None and pca_components:
+            projection = PCAProjection.fit(embeddings, pca_components)
+        if projection is not None:
+            embeddings = projection.transform(embeddings)
+
+        if mode == "float32":
+            return cls(np.ascontiguousarray(embeddings), mode, projection=projection)
+        if mode == "float16":
+            return cls(embeddings.astype(np.float16), mode, projection=projection)
+        if mode == "int8":
+            codes, scales = quantize_int8(embeddings)
+            return cls(codes, mode, scales=scales, projection=projection)
+
+        raise ValueError(f"Unknown embedding mode '{mode}', expected one of {MODES}.")
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    @property
+    def dim(self) -> int:
+        return self.data.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        total = self.data.nbytes
+        if self.scales is not None:
+            total += self.scales.nbytes
+        return total
+
+    def prepare_query(self, query: np.ndarray) -> np.ndarray:
+        query = np.atleast_2d(np.asarray(query, dtype=np.float32))
+        if self.projection is not None:
+            return self.projection.transform(query)
+        return query
+
+    def append(self, embeddings: np.ndarray) -> None:
+        other = CompactEmbeddings.from_dense(embeddings, self.mode, projection=self.projection)
+        self.data = np.concatenate((self.data, other.data))
+        if self.scales is not None:
+            self.scales = np.concatenate((self.scales, other.scales))
+
+    def cosine(self, query: np.ndarray, rows: Optional[np.ndarray] = None, block_size: int = DEFAULT_BLOCK_SIZE) -> np.ndarray:
+        queries = self.prepare_query(query)
+        n = len(self) if rows is None else len(rows)
+        out = np.empty((queries.shape[0], n), dtype=np.float32)
+
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            block = self.data[start:stop] if rows is None else self.data[rows[start:stop]]
+            scores = queries @ block.astype(np.float32).T
+            if self.scales is not None:
+                scale = self.scales[start:stop] if rows is None else self.scales[rows[start:stop]]
+                scores *= scale
+            out[:, start:stop] = scores
+
+        return out[0] if np.ndim(query) == 1 else out
+
+    def to_dense(self) -> np.ndarray:
+        dense = self.data.astype(np.float32)
+        if self.scales is not None:
+            dense *= self.scales[:, None]
+        return dense
+
+
+def quantize_int8(embeddings: np.ndarray):
+    max_abs = np.abs(embeddings).max(axis=1, keepdims=True)
+    codes = np.round(embeddings * (127.0 / np.maximum(max_abs, 1e-12))).astype(np.int8)
+    code_norms = np.linalg.norm(codes.astype(np.float32), axis=1)
+    scales = (1.0 / np.maximum(code_norms, 1e-12)).astype(np.float32)
+    return codes, scales
+
+
+def _ranks(x: np.ndarray) -> np.ndarray:
+    ranks = np.empty(len(x), dtype=np.float64)
+    ranks[np.argsort(x)] = np.arange(len(x))
+    return ranks
+
+
+def accuracy_report(
+    query_text: str,
+    texts: Sequence[str],
+    modes: Sequence[str] = MODES,
+    pca_dims: Sequence[Optional[int]] = (None, 128, 64),
+    top_k: int = 10
+) -> List[dict]:
+    from similarities import encode_texts
+
+    query = encode_texts([query_text])[0]
+    embeddings = encode_texts(list(texts))
+    reference = embeddings @ query
+    reference_top = set(np.argsort(-reference)[:top_k])
+    full_bytes = embeddings.nbytes
+
+    rows = []
+    for n_components in pca_dims:
+        if n_components is not None and n_components >= min(embeddings.shape):
+            continue
+        projection = PCAProjection.fit(embeddings, n_components) if n_components else None
+
+        for mode in modes:
+            compact = CompactEmbeddings.from_dense(embeddings, mode, projection=projection)
+            scores = compact.cosine(query)
+            errors = np.abs(scores - reference)
+            rows.append({
+                "mode": mode,
+                "dims": compact.dim,
+                "bytes": compact.nbytes,
+                "bytes_per_vector": compact.nbytes / max(len(compact), 1),
+                "compression": full_bytes / max(compact.nbytes, 1),
+                "max_abs_error": float(errors.max()) if len(errors) else 0.0,
+                "mean_abs_error": float(errors.mean()) if len(errors) else 0.0,
+                "spearman": float(np.corrcoef(_ranks(scores), _ranks(reference))[0, 1]) if len(errors) > 1 else 1.0,
+                f"top{top_k}_overlap": len(reference_top & set(np.argsort(-scores)[:top_k])) / max(len(reference_top), 1),
+            })
+    return rows
+
+
+def format_report(rows: List[dict]) -> str:
+    if not rows:
+        return "No rows."
+    headers = list(rows[0].keys())
+    lines = ["  ".join(f"{h:>16}" for h in headers)]
+    for row in rows:
+        lines.append("  ".join(
+            f"{v:>16.4f}" if isinstance(v, float) else f"{v:>16}" for v in row.values()
+        ))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Accuracy vs memory of compact embeddings.")
+    parser.add_argument("texts_file", help="File with one job requirements text per line.")
+    parser.add_argument("--query", required=True, help="CV text scored against every line.")
+    args = parser.parse_args(argv)
+
+    with open(args.texts_file, "r", encoding="utf-8") as f:
+        texts = [line.strip() for line in f if line.strip()]
+
+    print(format_report(accuracy_report(args.query, texts)))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,141 @@
+import os
+import queue
+import threading
+from typing import Callable, Dict, List, Tuple
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from job import Job
+
+
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+PAGES_PER_DRIVER = 50
+WAIT_TIMEOUT = 10
+POLL_INTERVAL = 0.1
+MAX_ATTEMPTS = 2
+DETAILS_READY_SCRIPT = (
+    "return Array.from(document.querySelectorAll('h2'))"
+    ".some(h => h.textContent.includes('Job Details'));"
+)
+
+
+class DriverPool:
+    """N worker threads, each owning one browser, fed from a shared job queue.
+
+    A worker waits for the "Job Details" heading instead of sleeping, replaces
+    its browser after ``pages_per_driver`` pages, and after a WebDriver
+    crash re-queues the job (up to ``max_attempts`` tries) on a fresh browser.
+    """
+
+    def __init__(
+        self,
+        driver_factory: Callable,
+        workers: int = DEFAULT_WORKERS,
+        pages_per_driver: int = PAGES_PER_DRIVER,
+        wait_timeout: float = WAIT_TIMEOUT,
+        poll_interval: float = POLL_INTERVAL,
+        max_attempts: int = MAX_ATTEMPTS
+    ):
+        self.driver_factory = driver_factory
+        self.workers = max(1, workers)
+        self.pages_per_driver = pages_per_driver
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.stats = {"pages": 0, "timeouts": 0, "crashes": 0, "drivers_started": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _start_driver(self):
+        driver = self.driver_factory()
+        self._count("drivers_started")
+        return driver
+
+    @staticmethod
+    def _quit(driver) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _wait_for_details(self, driver) -> None:
+        try:
+            wait = WebDriverWait(driver, self.wait_timeout, poll_frequency=self.poll_interval)
+            wait.until(lambda d: d.execute_script(DETAILS_READY_SCRIPT))
+        except TimeoutException:
+            # Extract anyway: the script reports N/A for whatever is missing, as it did after the fixed sleep.
+            self._count("timeouts")
+
+    def _work(self, tasks: queue.Queue, script: str, results: Dict[int, Dict], errors: List[Exception]) -> None:
+        driver = None
+        pages = 0
+        try:
+            while True:
+                try:
+                    index, job, attempt = tasks.get_nowait()
+                except queue.Empty:
+                    return
+
+                if driver is None or pages >= self.pages_per_driver:
+                    if driver is not None:
+                        self._quit(driver)
+                        driver = None
+                    try:
+                        driver = self._start_driver()
+                    except Exception as e:
+                        tasks.put((index, job, attempt))
+                        errors.append(e)
+                        return
+                    pages = 0
+
+                try:
+                    driver.get(job.link)
+                    self._wait_for_details(driver)
+                    data = driver.execute_script(script)
+                    pages += 1
+                    self._count("pages")
+                except WebDriverException as e:
+                    self._count("crashes")
+                    self._quit(driver)
+                    driver = None
+                    if attempt + 1 < self.max_attempts:
+                        tasks.put((index, job, attempt + 1))
+                    else:
+                        print(f"Error extracting details for {job.link}: {e}")
+                    continue
+
+                if isinstance(data, dict):
+                    results[index] = data
+                else:
+                    print(f"Unexpected data format for {job.link}")
+        finally:
+            if driver is not None:
+                self._quit(driver)
+
+    def run(self, jobs: List[Job], script: str) -> List[Tuple[Job, Dict]]:
+        tasks: queue.Queue = queue.Queue()
+        for index, job in enumerate(jobs):
+            tasks.put((index, job, 0))
+
+        results: Dict[int, Dict] = {}
+        errors: List[Exception] = []
+        threads = [
+            threading.Thread(target=self._work, args=(tasks, script, results, errors), daemon=True)
+            for _ in range(min(self.workers, len(jobs)))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Workers that cannot start a browser hand their job back; if none could, nothing was scraped.
+        if not tasks.empty() and errors:
+            if not results:
+                raise RuntimeError("Chrome WebDriver error while creating driver.") from errors[0]
+            print(f"{tasks.qsize()} jobs left unscraped after WebDriver start failures: {errors[0]}")
+
+        return [(jobs[index], results[index]) for index in sorted(results)]
@@ -0,0 +1,183 @@
+import atexit
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "JOB_RECOMMENDER_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "job_recommender")
+)
+DEFAULT_MAX_ENTRIES = 200_000
+# Eviction trims to this fraction of ``max_entries``, so a full cache compacts once per 10% of churn, not per store.
+LOW_WATER = 0.9
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(str(text).split())
+
+
+def cache_key(model_name: str, text: str) -> str:
+    return hashlib.sha1(f"{model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Append-only on-disk embedding store with LRU eviction.
+
+    Vectors live in a flat float32 file that is memory-mapped for reads and
+    only ever appended to; ``index.log`` maps content hashes to row numbers.
+    Going over ``max_entries`` evicts down to ``LOW_WATER`` of it and rewrites
+    both files in recency order.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        dim: int,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        self.model_name = model_name
+        self.dim = dim
+        self.max_entries = max_entries
+        self.directory = os.path.join(cache_dir, re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name), str(dim))
+        self.vectors_path = os.path.join(self.directory, "vectors.f32")
+        self.index_path = os.path.join(self.directory, "index.log")
+
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._rows = 0
+        self._mmap: Optional[np.memmap] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+        atexit.register(self.flush)
+
+    def _load(self) -> None:
+        if os.path.exists(self.vectors_path):
+            row_bytes = 4 * self.dim
+            self._rows = os.path.getsize(self.vectors_path) // row_bytes
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(self._rows * row_bytes)
+
+        if not os.path.exists(self.index_path):
+            return
+
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) != 2:
+                    continue
+                key, row = parts[0], int(parts[1])
+                if row < self._rows:
+                    self._index[key] = row
+                    self._index.move_to_end(key)
+
+    def _vectors(self) -> np.memmap:
+        if self._mmap is None or self._mmap.shape[0] != self._rows:
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self._rows, self.dim))
+        return self._mmap
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, texts: Sequence[str]) -> Tuple[np.ndarray, List[int]]:
+        embeddings = np.zeros((len(texts), self.dim), dtype=np.float32)
+        missing: List[int] = []
+
+        with self._lock:
+            positions, rows = [], []
+            for i, text in enumerate(texts):
+                key = cache_key(self.model_name, text)
+                row = self._index.get(key)
+                if row is None:
+                    missing.append(i)
+                else:
+                    self._index.move_to_end(key)
+                    positions.append(i)
+                    rows.append(row)
+
+            if rows:
+                embeddings[positions] = self._vectors()[rows]
+                self._dirty = True
+
+        return embeddings, missing
+
+    def store(self, texts: Sequence[str], embeddings: np.ndarray) -> None:
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32).reshape(-1, self.dim)
+
+        with self._lock:
+            new_keys, new_rows, seen = [], [], set()
+            for text, vector in zip(texts, embeddings):
+                key = cache_key(self.model_name, text)
+                if key in self._index:
+                    self._index.move_to_end(key)
+                    continue
+                if key in seen:
+                    continue
+                seen.add(key)
+                new_keys.append(key)
+                new_rows.append(vector)
+
+            if not new_keys:
+                return
+
+            with open(self.vectors_path, "ab") as f:
+                f.write(np.stack(new_rows).tobytes())
+
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                for offset, key in enumerate(new_keys):
+                    self._index[key] = self._rows + offset
+                    f.write(f"{key} {self._rows + offset}\n")
+
+            self._rows += len(new_keys)
+
+            if len(self._index) > self.max_entries:
+                low_water = int(self.max_entries * LOW_WATER)
+                while len(self._index) > low_water:
+                    self._index.popitem(last=False)
+                self._compact()
+
+    def _compact(self) -> None:
+        keys = list(self._index.keys())
+        rows = np.fromiter(self._index.values(), dtype=np.int64, count=len(keys))
+        survivors = np.array(self._vectors()[rows]) if len(rows) else np.zeros((0, self.dim), dtype=np.float32)
+        self._mmap = None
+
+        tmp_vectors = self.vectors_path + ".tmp"
+        with open(tmp_vectors, "wb") as f:
+            f.write(survivors.tobytes())
+        os.replace(tmp_vectors, self.vectors_path)
+
+        self._index = OrderedDict((key, row) for row, key in enumerate(keys))
+        self._rows = len(keys)
+        self._write_index()
+
+    def _write_index(self) -> None:
+        tmp_index = self.index_path + ".tmp"
+        with open(tmp_index, "w", encoding="utf-8") as f:
+            for key, row in self._index.items():
+                f.write(f"{key} {row}\n")
+        os.replace(tmp_index, self.index_path)
+        self._dirty = False
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._dirty:
+                self._write_index()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index.clear()
+            self._mmap = None
+            self._rows = 0
+            for path in (self.vectors_path, self.index_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._dirty = False
@@ -0,0 +1,229 @@
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+import requests
+
+from http_fetch import DEFAULT_TIMEOUT, fetch, fetch_cache_only
+
+
+THROTTLE_STATUSES = (429, 503)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+STATS_WINDOW = 10.0
+
+
+class FetchController:
+    """Shared rate and concurrency control for scraper fetches.
+
+    A token bucket caps requests per second and an AIMD limit caps requests in
+    flight. Both grow quickly until the first sign of overload and additively
+    after it; a latency EWMA above ``target_latency``, an error rate above
+    ``error_threshold`` over the last ``window`` fetches, or a 429/503 halves
+    them (at most once per ``cooldown`` seconds). Failed fetches are retried
+    with full-jitter exponential backoff, honouring ``Retry-After``. Pages
+    served from a cache-only HTTP cache bypass the controller entirely.
+    """
+
+    def __init__(
+        self,
+        rate: float = 8.0,
+        max_rate: float = 32.0,
+        burst: int = 8,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        target_latency: float = 2.0,
+        error_threshold: float = 0.2,
+        window: int = 20,
+        cooldown: float = 1.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0
+    ):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.limit = float(initial_concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+        self._slow_start = True
+        self._last_decrease = 0.0
+        self._outcomes: deque = deque(maxlen=window)
+        self._started = time.monotonic()
+        self._completed: deque = deque()
+        self._latency = 0.0
+        self.counters = {"requests": 0, "successes": 0, "errors": 0, "throttled": 0, "retries": 0, "decreases": 0}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def _wait_time(self, now: float) -> float:
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= int(self.limit):
+            return 1.0  # woken by release()
+        self._refill(now)
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+        return 0.0
+
+    @contextmanager
+    def slot(self):
+        with self._cond:
+            while True:
+                delay = self._wait_time(time.monotonic())
+                if delay <= 0:
+                    break
+                self._cond.wait(delay)
+            self._tokens -= 1
+            self._in_flight += 1
+            self.counters["requests"] += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def _decrease(self, now: float, throttled: bool) -> None:
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._slow_start = False
+        self.counters["decreases"] += 1
+        self.limit = max(self.min_concurrency, self.limit / 2)
+        if throttled:
+            self.rate = max(0.5, self.rate / 2)
+
+    def _increase(self) -> None:
+        if self._slow_start:
+            self.limit = min(self.max_concurrency, self.limit + 1)
+            self.rate = min(self.max_rate, self.rate + 1)
+        else:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self.rate = min(self.max_rate, self.rate + 1 / self.rate)
+
+    def _on_success(self, latency: float) -> None:
+        with self._cond:
+            now = time.monotonic()
+            self.counters["successes"] += 1
+            self._completed.append(now)
+            self._outcomes.append(True)
+            self._latency = latency if self._latency == 0.0 else 0.8 * self._latency + 0.2 * latency
+            if self._latency > self.target_latency:
+                self._decrease(now, throttled=False)
+            else:
+                self._increase()
+            self._cond.notify_all()
+
+    def _on_failure(self, throttled: bool, retry_after: Optional[float]) -> None:
+        # Only retryable failures count: they are the overload signal.
+        with self._cond:
+            now = time.monotonic()
+            self.counters["throttled" if throttled else "errors"] += 1
+            self._outcomes.append(False)
+            # Isolated failures before the window fills are not a rate yet.
+            full = len(self._outcomes) == self._outcomes.maxlen
+            error_rate = self._outcomes.count(False) / len(self._outcomes)
+            if throttled or (full and error_rate > self.error_threshold):
+                self._decrease(now, throttled)
+            if throttled and retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def fetch(self, session: requests.Session, url: str, timeout: float = DEFAULT_TIMEOUT) -> bytes:
+        # Cache-only replays never reach the network: no token, no slot, and no say in the limits or stats.
+        content = fetch_cache_only(url)
+        if content is not None:
+            return content
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.slot():
+                    start = time.monotonic()
+                    content = fetch(session, url, timeout)
+                    latency = time.monotonic() - start
+            except RuntimeError as e:
+                retryable, throttled, retry_after = _classify(e)
+                if not retryable:
+                    raise
+                self._on_failure(throttled, retry_after)
+                if attempt == self.max_retries:
+                    raise
+                with self._cond:
+                    self.counters["retries"] += 1
+                time.sleep(max(self.backoff(attempt), retry_after or 0.0))
+                continue
+
+            self._on_success(latency)
+            return content
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            now = time.monotonic()
+            while self._completed and self._completed[0] < now - STATS_WINDOW:
+                self._completed.popleft()
+            window = min(STATS_WINDOW, now - self._started) or 1e-9
+            return dict(
+                self.counters,
+                in_flight=self._in_flight,
+                concurrency_limit=int(self.limit),
+                rate=self.rate,
+                throughput=len(self._completed) / window,
+                latency_ewma=self._latency,
+            )
+
+
+def _classify(error: RuntimeError) -> Tuple[bool, bool, Optional[float]]:
+    # (retryable, throttled, Retry-After seconds) for a failed fetch(). Cache-only misses
+    # and statuses such as 404 are final; timeouts, connection errors and 5xx/429 are not.
+    cause = error.__cause__
+    if not isinstance(cause, requests.RequestException):
+        return False, False, None
+    response = cause.response
+    if response is None:
+        return True, False, None
+
+    retry_after = response.headers.get("Retry-After") if response.headers else None
+    try:
+        retry_after = float(retry_after) if retry_after is not None else None
+    except ValueError:
+        retry_after = None  # HTTP-date form: fall back to our own backoff
+    return response.status_code in RETRY_STATUSES, response.status_code in THROTTLE_STATUSES, retry_after
+
+
+_controller: Optional[FetchController] = None
+_controller_lock = threading.Lock()
+
+
+def get_fetch_controller() -> FetchController:
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = FetchController()
+        return _controller
+
+
+def set_fetch_controller(controller: Optional[FetchController]) -> None:
+    global _controller
+    with _controller_lock:
+        _controller = controller
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from embedding_cache import DEFAULT_CACHE_DIR
+
+
+DEFAULT_HTTP_CACHE_DIR = os.path.join(DEFAULT_CACHE_DIR, "http")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+COMPRESSION_LEVEL = 6
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    content: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """Compressed on-disk cache of response bodies keyed by URL.
+
+    Each entry is one file: a JSON header line (URL, validators, fetch time)
+    followed by the zlib-compressed body. Entries are evicted least recently
+    used first once the files exceed ``max_bytes``; file mtimes carry the
+    recency across runs. With ``cache_only`` nothing goes to the network.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_HTTP_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        cache_only: bool = False
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.cache_only = cache_only
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "evicted": 0}
+
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".z"):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append((stat.st_mtime, name[:-2], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self._total += size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".z")
+
+    @staticmethod
+    def key(url: str) -> str:
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def size_bytes(self) -> int:
+        return self._total
+
+    def record(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        key = self.key(url)
+        if key not in self._sizes:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                header = json.loads(f.readline())
+                content = zlib.decompress(f.read())
+        except (OSError, ValueError, zlib.error):
+            self._discard(key)
+            return None
+        if header.get("url") != url:
+            return None
+
+        return CachedResponse(
+            url, content, header.get("etag"), header.get("last_modified"), header.get("fetched_at", 0.0)
+        )
+
+    def put(
+        self,
+        url: str,
+        content: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        key = self.key(url)
+        header = {"url": url, "etag": etag, "last_modified": last_modified, "fetched_at": time.time()}
+        data = json.dumps(header).encode("utf-8") + b"\n" + zlib.compress(content, COMPRESSION_LEVEL)
+
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._total += len(data) - self._sizes.pop(key, 0)
+            self._sizes[key] = len(data)
+            self.stats["stored"] += 1
+            self._evict()
+
+    def touch(self, url: str) -> None:
+        key = self.key(url)
+        with self._lock:
+            if key not in self._sizes:
+                return
+            self._sizes.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _discard(self, key: str) -> None:
+        with self._lock:
+            self._total -= self._sizes.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes and len(self._sizes) > 1:
+            key, size = self._sizes.popitem(last=False)
+            self._total -= size
+            self.stats["evicted"] += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in self._sizes:
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._sizes.clear()
+            self._total = 0
@@ -0,0 +1,95 @@
+import os
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from http_cache import HttpCache
+
+
+DEFAULT_TIMEOUT = 10
+DEFAULT_POOL_SIZE = 16
+DEFAULT_RETRIES = 3
+# "0" disables the on-disk cache, "only" serves from it without touching the network.
+HTTP_CACHE_MODE = os.environ.get("JOB_RECOMMENDER_HTTP_CACHE", "1")
+
+_http_cache: Optional[HttpCache] = None
+_http_cache_enabled = HTTP_CACHE_MODE != "0"
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    global _http_cache
+    if _http_cache is None and _http_cache_enabled:
+        _http_cache = HttpCache(cache_only=HTTP_CACHE_MODE == "only")
+    return _http_cache
+
+
+def set_http_cache(cache: Optional[HttpCache]) -> None:
+    global _http_cache, _http_cache_enabled
+    _http_cache = cache
+    _http_cache_enabled = cache is not None
+
+
+def cache_only() -> bool:
+    cache = get_http_cache()
+    return cache is not None and cache.cache_only
+
+
+def create_session(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    retries: int = DEFAULT_RETRIES,
+    backoff_factor: float = 0.5
+) -> requests.Session:
+    # retries=0 leaves retrying (and the status codes) to the caller, e.g. a FetchController.
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        respect_retry_after_header=True
+    ) if retries else 0
+    # One pool per host, sized for the number of worker threads sharing the session.
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_cache_only(url: str) -> Optional[bytes]:
+    # The body when cache-only mode serves ``url`` without the network; None when it has to be requested.
+    cache = get_http_cache()
+    if cache is None or not cache.cache_only:
+        return None
+    cached = cache.get(url)
+    if cached is None:
+        cache.record("misses")
+        raise RuntimeError(f"{url} is not in the HTTP cache (cache-only mode)")
+    cache.touch(url)
+    cache.record("hits")
+    return cached.content
+
+
+def fetch(session: requests.Session, url: str, timeout: float = DEFAULT_TIMEOUT) -> bytes:
+    content = fetch_cache_only(url)
+    if content is not None:
+        return content
+
+    cache = get_http_cache()
+    cached = cache.get(url) if cache is not None else None
+    try:
+        response = session.get(url, timeout=timeout, headers=cached.validators() if cached else None)
+        if response.status_code == 304 and cached is not None:
+            cache.touch(url)
+            cache.record("revalidated")
+            return cached.content
+        response.raise_for_status()
+    except requests.RequestException as e:
+        raise RuntimeError(f"Request error while fetching {url}") from e
+
+    if cache is not None:
+        cache.record("misses")
+        cache.put(url, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return response.content
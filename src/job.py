@@ -30,6 +30,10 @@ class Job:
             return self.link == other.link
         return False
 
+
+def has_link(job: Job) -> bool:
+    return bool(job.link) and job.link != "N/A"
+
     
 def parse_experience(exp_str: str) -> int:
     if not exp_str or exp_str == "N/A":
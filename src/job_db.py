@@ -0,0 +1,236 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import fields
+from typing import Dict, Iterable, List, Optional, Set
+
+from embedding_cache import DEFAULT_CACHE_DIR
+from job import Job
+
+
+DEFAULT_DB_PATH = os.environ.get("JOB_RECOMMENDER_DB", os.path.join(DEFAULT_CACHE_DIR, "jobs.sqlite3"))
+DEFAULT_TTL = 24 * 60 * 60
+# Skip scraping and build searches from the store alone (independent of the model's offline mode).
+DB_ONLY = os.environ.get("JOB_RECOMMENDER_DB_ONLY", "0") == "1"
+
+LISTING_FIELDS = ("title", "company", "country", "city", "area", "job_type", "work_place")
+DETAIL_FIELDS = ("salary", "experience_needed", "career_level", "education_level", "categories", "skills", "requirements")
+JSON_FIELDS = ("salary", "categories", "skills")
+JOB_FIELDS = {f.name for f in fields(Job)}
+DETAIL_DEFAULTS = {name: getattr(Job(), name) for name in DETAIL_FIELDS}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    link TEXT PRIMARY KEY,
+    job_search TEXT,
+    title TEXT, company TEXT, country TEXT, city TEXT, area TEXT, job_type TEXT, work_place TEXT,
+    salary TEXT, experience_needed INTEGER, career_level TEXT, education_level TEXT,
+    categories TEXT, skills TEXT, requirements TEXT,
+    listed_at REAL NOT NULL,
+    details_at REAL
+);
+CREATE TABLE IF NOT EXISTS job_searches (
+    query TEXT NOT NULL,
+    link TEXT NOT NULL REFERENCES jobs(link) ON DELETE CASCADE,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (query, link)
+);
+CREATE INDEX IF NOT EXISTS job_searches_link ON job_searches(link);
+"""
+
+
+class JobDatabase:
+    """SQLite store of scraped jobs keyed by ``Job.link``.
+
+    Listing and detail fields are written separately, each with its fetch
+    time; details older than ``ttl`` seconds are stale. ``job_searches``
+    records which queries found which links so a search can be replayed offline;
+    queries are stored and looked up by ``query_key``.
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, ttl: float = DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+            self._normalize_queries()
+
+    def _normalize_queries(self) -> None:
+        # Stores written before queries were keyed by ``query_key`` hold them as typed.
+        queries = [row[0] for row in self._conn.execute("SELECT DISTINCT query FROM job_searches")]
+        for query in queries:
+            key = query_key(query)
+            if key == query:
+                continue
+            self._conn.execute(
+                "INSERT INTO job_searches (query, link, seen_at) SELECT ?, link, seen_at FROM job_searches "
+                "WHERE query = ? ON CONFLICT(query, link) DO UPDATE SET seen_at = MAX(seen_at, excluded.seen_at)",
+                (key, query)
+            )
+            self._conn.execute("DELETE FROM job_searches WHERE query = ?", (query,))
+
+    def __enter__(self) -> "JobDatabase":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def _links_where(self, links: List[str], condition: str, *params) -> Set[str]:
+        found: Set[str] = set()
+        # Stay under SQLite's bound-parameter limit.
+        for start in range(0, len(links), 500):
+            chunk = links[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT link FROM jobs WHERE link IN ({placeholders}) {condition}", (*chunk, *params)
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def known_links(self, links: Iterable[str], query: Optional[str] = None) -> Set[str]:
+        # With ``query``, only links an earlier run of that query listed.
+        with self._lock:
+            if query is None:
+                return self._links_where(list(links), "")
+            return self._links_where(
+                list(links), "AND link IN (SELECT link FROM job_searches WHERE query = ?)", query_key(query)
+            )
+
+    def fresh_links(self, links: Iterable[str], now: Optional[float] = None) -> Set[str]:
+        cutoff = (now or time.time()) - self.ttl
+        with self._lock:
+            return self._links_where(list(links), "AND details_at IS NOT NULL AND details_at >= ?", cutoff)
+
+    def save_listings(self, jobs: Iterable[Job], query: Optional[str] = None) -> None:
+        now = time.time()
+        rows = [
+            (job.link, job.job_search, *(getattr(job, name) for name in LISTING_FIELDS), now)
+            for job in jobs if job.link != "N/A"
+        ]
+        columns = ("link", "job_search", *LISTING_FIELDS, "listed_at")
+        updates = ", ".join(f"{name} = excluded.{name}" for name in columns[1:])
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT(link) DO UPDATE SET {updates}",
+                rows
+            )
+            if query is not None:
+                self._conn.executemany(
+                    "INSERT INTO job_searches (query, link, seen_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(query, link) DO UPDATE SET seen_at = excluded.seen_at",
+                    [(query_key(query), row[0], now) for row in rows]
+                )
+
+    def save_labels(self, jobs: Iterable[Job]) -> None:
+        # Stores each job's ``job_search``, e.g. the merged label of a batch of queries.
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE jobs SET job_search = ? WHERE link = ?",
+                [(job.job_search, job.link) for job in jobs if job.link != "N/A"]
+            )
+
+    def save_details(self, jobs: Iterable[Job]) -> None:
+        # Jobs whose details are all still defaults were not scraped and stay stale.
+        now = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in DETAIL_FIELDS)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"UPDATE jobs SET {assignments}, details_at = ? WHERE link = ?",
+                [(*_encode_details(job), now, job.link) for job in jobs if _has_details(job)]
+            )
+
+    def fill_details(self, jobs: List[Job], now: Optional[float] = None) -> List[Job]:
+        # Copies stored details onto jobs whose details are fresh; returns the jobs that still need scraping.
+        fresh = self.fresh_links([job.link for job in jobs], now)
+        if not fresh:
+            return list(jobs)
+
+        stored = {job.link: job for job in self.get_jobs(fresh)}
+        stale = []
+        for job in jobs:
+            cached = stored.get(job.link)
+            if cached is None:
+                stale.append(job)
+                continue
+            for name in DETAIL_FIELDS:
+                setattr(job, name, getattr(cached, name))
+        return stale
+
+    def get_jobs(self, links: Iterable[str]) -> List[Job]:
+        links = list(links)
+        jobs: List[Job] = []
+        with self._lock:
+            for start in range(0, len(links), 500):
+                chunk = links[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT * FROM jobs WHERE link IN ({','.join('?' * len(chunk))})", chunk
+                )
+                jobs.extend(_row_to_job(row) for row in rows)
+        return jobs
+
+    def load_jobs(self, query: Optional[str] = None, fresh_only: bool = False, recent_only: bool = False) -> List[Job]:
+        # ``fresh_only`` keeps jobs whose details are within the TTL, ``recent_only`` those listed within it.
+        sql = "SELECT jobs.* FROM jobs"
+        conditions: List[str] = []
+        params: list = []
+        if query is not None:
+            sql += " JOIN job_searches ON job_searches.link = jobs.link"
+            conditions.append("job_searches.query = ?")
+            params.append(query_key(query))
+        cutoff = time.time() - self.ttl
+        if fresh_only:
+            conditions.append("details_at >= ?")
+            params.append(cutoff)
+        if recent_only:
+            conditions.append("jobs.listed_at >= ?")
+            params.append(cutoff)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY jobs.listed_at DESC, jobs.link"
+
+        with self._lock:
+            return [_row_to_job(row) for row in self._conn.execute(sql, params)]
+
+    def prune(self, max_age: float) -> int:
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM jobs WHERE listed_at < ?", (time.time() - max_age,)).rowcount
+
+
+def query_key(query: str) -> str:
+    # Queries that differ only in case or whitespace are the same search.
+    return " ".join(query.split()).casefold()
+
+
+def _has_details(job: Job) -> bool:
+    return any(getattr(job, name) != DETAIL_DEFAULTS[name] for name in DETAIL_FIELDS)
+
+
+def _encode_details(job: Job) -> List:
+    return [json.dumps(getattr(job, name)) if name in JSON_FIELDS else getattr(job, name) for name in DETAIL_FIELDS]
+
+
+def _row_to_job(row: sqlite3.Row) -> Job:
+    values: Dict[str, object] = {}
+    for name in row.keys():
+        if name not in JOB_FIELDS or row[name] is None:
+            continue
+        values[name] = json.loads(row[name]) if name in JSON_FIELDS else row[name]
+    return Job(**values)
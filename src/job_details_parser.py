@@ -0,0 +1,157 @@
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Union
+
+from lxml import html as lxml_html
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils", "fixtures", "job_details")
+FIELDS = ("experience", "careerLevel", "education", "salary", "categories", "skills", "requirements")
+DETAIL_LABELS = (
+    ("experience", "Experience Needed:"),
+    ("careerLevel", "Career Level:"),
+    ("education", "Education Level:"),
+    ("salary", "Salary:"),
+)
+# String.prototype.trim() whitespace; str.strip() would also strip \x1c-\x1f.
+JS_WHITESPACE = "\t\n\v\f\r \u00a0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a" \
+                "\u2028\u2029\u202f\u205f\u3000\ufeff"
+
+
+def _trim(text: str) -> str:
+    return text.strip(JS_WHITESPACE)
+
+
+def _text(element) -> str:
+    return _trim(element.text_content())
+
+
+def _elements(element) -> List:
+    return [el for el in element.iterdescendants() if isinstance(el.tag, str)]
+
+
+def _next_element(element):
+    sibling = element.getnext()
+    while sibling is not None and not isinstance(sibling.tag, str):
+        sibling = sibling.getnext()
+    return sibling
+
+
+def _child_node_count(element) -> int:
+    count = 1 if element.text else 0
+    for child in element:
+        count += 2 if child.tail else 1
+    return count
+
+
+def _first_heading(document, tag: str, needle: str):
+    return next((h for h in document.iter(tag) if needle in h.text_content()), None)
+
+
+def extract_job_details(content: Union[bytes, str]) -> Dict[str, str]:
+    # Line-for-line port of extractJobDetails() in utils/job_details_extractor.js.
+    result = {name: "N/A" for name in FIELDS}
+    document = lxml_html.document_fromstring(content)
+
+    job_details = _first_heading(document, "h2", "Job Details")
+    section = job_details.getparent() if job_details is not None else None
+    if section is not None:
+        for div in section.iterdescendants("div"):
+            text = _text(div)
+            for name, label in DETAIL_LABELS:
+                if not text.startswith(label):
+                    continue
+                for child in _elements(div):
+                    child_text = _text(child)
+                    if child_text and ":" not in child_text and child_text != text:
+                        result[name] = child_text
+                        break
+
+        category_label = next(
+            (el for el in _elements(section) if _child_node_count(el) == 1 and _text(el) == "Job Categories:"),
+            None
+        )
+        if category_label is not None:
+            category_list = _next_element(category_label)
+            if category_list is not None:
+                categories = [_text(a) for a in category_list.iterdescendants("a")]
+                result["categories"] = " | ".join(categories) if categories else "N/A"
+
+    skills_heading = _first_heading(document, "h4", "Skills")
+    if skills_heading is not None:
+        container = _next_element(skills_heading)
+        if container is not None:
+            skills = list(dict.fromkeys(_text(a) for a in container.iterdescendants("a")))
+            result["skills"] = " | ".join(skills) if skills else "N/A"
+
+    requirements_heading = _first_heading(document, "h2", "Job Requirements")
+    if requirements_heading is not None:
+        requirements_section = _next_element(requirements_heading)
+        if requirements_section is not None:
+            result["requirements"] = _text(requirements_section)[:500] or "N/A"
+
+    return result
+
+
+def parse_job_details(content: Union[bytes, str]) -> Optional[Dict[str, str]]:
+    # None when the page came back without the rendered job sections (the caller falls back to Selenium).
+    try:
+        data = extract_job_details(content)
+    except Exception:
+        return None
+    return data if any(value != "N/A" for value in data.values()) else None
+
+
+def _fixture_files(fixture_dir: str) -> List[str]:
+    return sorted(name for name in os.listdir(fixture_dir) if name.endswith(".html"))
+
+
+def check_fixtures(fixture_dir: str = FIXTURE_DIR, use_selenium: bool = False) -> List[str]:
+    with open(os.path.join(fixture_dir, "expected.json"), "r", encoding="utf-8") as f:
+        expected = json.load(f)
+
+    driver = script = None
+    if use_selenium:
+        from wuzzuf_scraper import create_chrome_driver, load_extract_script
+        driver = create_chrome_driver()
+        script = load_extract_script()
+
+    mismatches = []
+    try:
+        for name in _fixture_files(fixture_dir):
+            path = os.path.join(fixture_dir, name)
+            with open(path, "rb") as f:
+                ours = extract_job_details(f.read())
+            references = {"expected.json": expected.get(name)}
+            if driver is not None:
+                driver.get("file://" + os.path.abspath(path))
+                references["selenium"] = driver.execute_script(script)
+
+            for source, reference in references.items():
+                for field in FIELDS:
+                    theirs = (reference or {}).get(field)
+                    if ours[field] != theirs:
+                        mismatches.append(f"{name} {field}: lxml={ours[field]!r} {source}={theirs!r}")
+    finally:
+        if driver is not None:
+            driver.quit()
+    return mismatches
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Check the lxml detail extractor against the hand-written fixtures.")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR)
+    parser.add_argument("--selenium", action="store_true", help="also run the JS extractor in Chrome on each fixture")
+    args = parser.parse_args(argv)
+
+    mismatches = check_fixtures(args.fixtures, args.selenium)
+    for line in mismatches:
+        print(line)
+    print(f"{len(_fixture_files(args.fixtures))} fixtures, {len(mismatches)} mismatches")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,249 @@
+import argparse
+import sys
+import tracemalloc
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from job import Job, has_link
+
+
+STRING_FIELDS = (
+    "job_search", "title", "company", "country", "city", "area",
+    "job_type", "work_place", "career_level", "education_level"
+)
+TEXT_FIELDS = ("link", "requirements")
+
+
+class StringPool:
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def intern(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def copy(self) -> "StringPool":
+        clone = StringPool()
+        clone.codes = dict(self.codes)
+        clone.values = list(self.values)
+        return clone
+
+
+class GrowableArray:
+    def __init__(self, dtype, capacity: int = 16):
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        if needed > len(self._data):
+            grown = np.zeros(max(needed, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+
+    def append(self, value) -> None:
+        self._reserve(1)
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values: Sequence) -> None:
+        self._reserve(len(values))
+        self._data[self._size:self._size + len(values)] = values
+        self._size += len(values)
+
+    def view(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    def copy(self) -> "GrowableArray":
+        clone = GrowableArray(self._data.dtype, capacity=max(len(self._data), 1))
+        clone.extend(self.view())
+        return clone
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+
+class JobStore:
+    """Columnar job storage addressed by dense integer ids.
+
+    Short, repetitive fields (company, city, skills, ...) are interned into one
+    ``StringPool``; skills and categories are CSR lists of pool codes; numeric
+    fields are NumPy arrays. ``Job`` objects are only built by ``materialize``.
+    """
+
+    def __init__(self):
+        self.pool = StringPool()
+        self.text: Dict[str, List[str]] = {name: [] for name in TEXT_FIELDS}
+        self.codes: Dict[str, GrowableArray] = {name: GrowableArray(np.int32) for name in STRING_FIELDS}
+        self.experience_needed = GrowableArray(np.int32)
+        self.salary = GrowableArray(np.float64)
+        self.salary_text = GrowableArray(np.int32)
+        self.skill_offsets = GrowableArray(np.int64)
+        self.skill_codes = GrowableArray(np.int32)
+        self.category_offsets = GrowableArray(np.int64)
+        self.category_codes = GrowableArray(np.int32)
+        self.removed = GrowableArray(np.bool_)
+        self.skill_offsets.append(0)
+        self.category_offsets.append(0)
+        self.link_ids: Dict[str, int] = {}
+        self.removed_count = 0
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Job]) -> "JobStore":
+        store = cls()
+        store.extend(jobs)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.text["link"])
+
+    def copy(self) -> "JobStore":
+        clone = JobStore.__new__(JobStore)
+        clone.pool = self.pool.copy()
+        clone.text = {name: list(values) for name, values in self.text.items()}
+        clone.codes = {name: array.copy() for name, array in self.codes.items()}
+        for name in ("experience_needed", "salary", "salary_text", "skill_offsets", "skill_codes",
+                     "category_offsets", "category_codes", "removed"):
+            setattr(clone, name, getattr(self, name).copy())
+        clone.link_ids = dict(self.link_ids)
+        clone.removed_count = self.removed_count
+        return clone
+
+    def append(self, job: Job) -> int:
+        job_id = len(self)
+        for name in TEXT_FIELDS:
+            self.text[name].append(getattr(job, name))
+        for name in STRING_FIELDS:
+            self.codes[name].append(self.pool.intern(getattr(job, name)))
+
+        self.experience_needed.append(job.experience_needed)
+        if isinstance(job.salary, (int, float)) and not isinstance(job.salary, bool):
+            self.salary.append(job.salary)
+            self.salary_text.append(-1)
+        else:
+            self.salary.append(np.nan)
+            self.salary_text.append(self.pool.intern(str(job.salary)))
+
+        self.skill_codes.extend([self.pool.intern(skill) for skill in job.skills])
+        self.skill_offsets.append(len(self.skill_codes))
+        self.category_codes.extend([self.pool.intern(category) for category in job.categories])
+        self.category_offsets.append(len(self.category_codes))
+        self.removed.append(False)
+
+        # Jobs without a link are stored but can't be looked up by it.
+        if has_link(job):
+            self.link_ids.setdefault(job.link, job_id)
+        return job_id
+
+    def remove(self, job_id: int) -> None:
+        removed = self.removed.view()
+        if removed[job_id]:
+            return
+        removed[job_id] = True
+        self.removed_count += 1
+        link = self.text["link"][job_id]
+        if self.link_ids.get(link) == job_id:
+            del self.link_ids[link]
+
+    def alive_ids(self) -> np.ndarray:
+        return np.flatnonzero(~self.removed.view())
+
+    def alive_count(self) -> int:
+        return len(self) - self.removed_count
+
+    def extend(self, jobs: Iterable[Job]) -> List[int]:
+        return [self.append(job) for job in jobs]
+
+    def id_of(self, job: Job) -> Optional[int]:
+        return self.link_ids.get(job.link)
+
+    def skills(self, job_id: int) -> List[str]:
+        offsets = self.skill_offsets.view()
+        return [self.pool.values[c] for c in self.skill_codes.view()[offsets[job_id]:offsets[job_id + 1]]]
+
+    def categories(self, job_id: int) -> List[str]:
+        offsets = self.category_offsets.view()
+        return [self.pool.values[c] for c in self.category_codes.view()[offsets[job_id]:offsets[job_id + 1]]]
+
+    def requirements(self, ids: Optional[Sequence[int]] = None) -> List[str]:
+        if ids is None:
+            return self.text["requirements"]
+        return [self.text["requirements"][i] for i in ids]
+
+    def skill_lists(self, ids: Optional[Sequence[int]] = None) -> List[List[str]]:
+        return [self.skills(i) for i in (range(len(self)) if ids is None else ids)]
+
+    def materialize(self, job_id: int) -> Job:
+        job_id = int(job_id)
+        values = {name: self.text[name][job_id] for name in TEXT_FIELDS}
+        for name in STRING_FIELDS:
+            values[name] = self.pool.values[self.codes[name].view()[job_id]]
+
+        salary_text = self.salary_text.view()[job_id]
+        values["salary"] = int(self.salary.view()[job_id]) if salary_text < 0 else self.pool.values[salary_text]
+        values["experience_needed"] = int(self.experience_needed.view()[job_id])
+        values["skills"] = self.skills(job_id)
+        values["categories"] = self.categories(job_id)
+        return Job(**values)
+
+    def materialize_many(self, ids: Iterable[int]) -> List[Job]:
+        return [self.materialize(i) for i in ids]
+
+    @property
+    def nbytes(self) -> int:
+        total = sum(array.nbytes for array in self.codes.values())
+        for array in (self.experience_needed, self.salary, self.salary_text, self.removed,
+                      self.skill_offsets, self.skill_codes, self.category_offsets, self.category_codes):
+            total += array.nbytes
+        return total
+
+
+def memory_report(n: int = 100_000, seed: int = 0) -> Dict[str, float]:
+    from synthetic import synthetic_jobs
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    jobs = list(synthetic_jobs(n, seed=seed))
+    list_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    del jobs
+
+    baseline = tracemalloc.get_traced_memory()[0]
+    store = JobStore.from_jobs(synthetic_jobs(n, seed=seed))
+    store_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    return {
+        "jobs": n,
+        "job_list_mb": list_bytes / 2 ** 20,
+        "job_store_mb": store_bytes / 2 ** 20,
+        "job_list_bytes_per_job": list_bytes / n,
+        "job_store_bytes_per_job": store_bytes / n,
+        "numeric_columns_mb": store.nbytes / 2 ** 20,
+        "ratio": list_bytes / max(store_bytes, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Memory of a list of Job objects vs a JobStore.")
+    parser.add_argument("--n", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    for key, value in memory_report(args.n).items():
+        print(f"{key:<26}{value:>14.2f}" if isinstance(value, float) else f"{key:<26}{value:>14}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
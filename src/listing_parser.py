@@ -0,0 +1,197 @@
+import os
+from typing import Callable, Dict, List, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+from lxml import html as lxml_html
+
+from job import Job
+
+
+# Synthetic search pages: Wuzzuf's card markup padded with generated styles, state JSON and navigation.
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils", "fixtures", "listings")
+
+# Wuzzuf's hashed class names, in one place. Each entry mirrors the BeautifulSoup lookup
+# it replaces: a multi-class string matches the whole class attribute, a single class
+# matches any one of the element's classes, and "*=" is a substring match.
+CARD_CLASS = "css-ghe2tq e1v1l3u10"
+LISTING_SELECTORS: Dict[str, tuple] = {
+    "title": ("h2", "css-193uk2c", "class"),
+    "company": ("a", "css-ipsyv7", "class"),
+    "location": ("span", "css-16x61xq", "class"),
+    "link": ("a", "css-o171kl", "class"),
+    "job_type": ("span", "css-uc9rga eoyjyou0", "class"),
+    "work_place": ("span", "css-uofntu eoyjyou0", "*="),
+}
+
+
+def _xpath_for(tag: str, value: str, match: str) -> str:
+    if match == "*=":
+        return f".//{tag}[contains(@class, '{value}')]"
+    if " " in value:
+        return f".//{tag}[normalize-space(@class)='{value}']"
+    return f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {value} ')]"
+
+
+CARD_XPATH = etree.XPath(f"//div[normalize-space(@class)='{CARD_CLASS}']")
+FIELD_XPATHS: Dict[str, etree.XPath] = {
+    name: etree.XPath(f"({_xpath_for(*selector)})[1]") for name, selector in LISTING_SELECTORS.items()
+}
+
+
+def _first(card, name: str):
+    found = FIELD_XPATHS[name](card)
+    return found[0] if found else None
+
+
+def _card_to_job(card, job_name: str) -> Job:
+    job = Job(job_search=job_name)
+
+    title_elem = _first(card, "title")
+    job.title = title_elem.text_content().strip() if title_elem is not None else "N/A"
+
+    company_elem = _first(card, "company")
+    job.company = company_elem.text_content().strip().rstrip(" -") if company_elem is not None else "N/A"
+
+    location_elem = _first(card, "location")
+    if location_elem is not None:
+        loc_parts = location_elem.text_content().split(',')
+        job.country = loc_parts[-1].strip() if len(loc_parts) > 0 else "N/A"
+        job.city = loc_parts[0].strip() if len(loc_parts) > 0 else "N/A"
+        job.area = loc_parts[1].strip() if len(loc_parts) > 1 else "N/A"
+
+    link_elem = _first(card, "link")
+    job.link = link_elem.get('href') if link_elem is not None else "N/A"
+
+    type_elem = _first(card, "job_type")
+    job.job_type = type_elem.text_content().strip() if type_elem is not None else "N/A"
+
+    workplace_elem = _first(card, "work_place")
+    # get_text(strip=True): strip each text node, then join.
+    job.work_place = "".join(t.strip() for t in workplace_elem.itertext()) if workplace_elem is not None else "N/A"
+
+    return job
+
+
+def parse_listing_page(content: Union[bytes, str], job_name: str, url: str = "") -> List[Job]:
+    # lxml parses the page in C and the card XPath skips the rest of the tree.
+    if not content or not content.strip():
+        return []
+    try:
+        cards = CARD_XPATH(lxml_html.document_fromstring(content))
+    except Exception as e:
+        raise RuntimeError(f"Parsing error while parsing response from {url}") from e
+
+    jobs = []
+    for card in cards:
+        try:
+            jobs.append(_card_to_job(card, job_name))
+        except Exception as e:
+            print(f"Error processing job card: {e}")
+            continue
+    return jobs
+
+
+def _soup_first(card, name: str):
+    tag, value, match = LISTING_SELECTORS[name]
+    if match == "*=":
+        return card.select_one(f"{tag}[class*='{value}']")
+    return card.find(tag, class_=value)
+
+
+def _soup_cards_to_jobs(job_cards, job_name: str) -> List[Job]:
+    jobs = []
+    for card in job_cards:
+        try:
+            job = Job(job_search=job_name)
+
+            title_elem = _soup_first(card, "title")
+            job.title = title_elem.text.strip() if title_elem else "N/A"
+
+            company_elem = _soup_first(card, "company")
+            job.company = company_elem.text.strip().rstrip(" -") if company_elem else "N/A"
+
+            location_elem = _soup_first(card, "location")
+            if location_elem:
+                loc_parts = location_elem.text.split(',')
+                job.country = loc_parts[-1].strip() if len(loc_parts) > 0 else "N/A"
+                job.city = loc_parts[0].strip() if len(loc_parts) > 0 else "N/A"
+                job.area = loc_parts[1].strip() if len(loc_parts) > 1 else "N/A"
+
+            link_elem = _soup_first(card, "link")
+            job.link = link_elem.get('href') if link_elem else "N/A"
+
+            type_elem = _soup_first(card, "job_type")
+            job.job_type = type_elem.text.strip() if type_elem else "N/A"
+
+            workplace_elem = _soup_first(card, "work_place")
+            job.work_place = workplace_elem.get_text(strip=True) if workplace_elem else "N/A"
+
+            jobs.append(job)
+        except Exception as e:
+            print(f"Error processing job card: {e}")
+            continue
+    return jobs
+
+
+def parse_listing_page_soup(content: Union[bytes, str], job_name: str, url: str = "") -> List[Job]:
+    # The original BeautifulSoup/html.parser path, kept as the reference for the fixture check and benchmark.
+    try:
+        soup = BeautifulSoup(content, 'html.parser')
+        job_cards = soup.find_all('div', class_=CARD_CLASS)
+    except Exception as e:
+        raise RuntimeError(f"Parsing error while parsing response from {url}") from e
+    return _soup_cards_to_jobs(job_cards, job_name)
+
+
+def parse_listing_page_strained(content: Union[bytes, str], job_name: str, url: str = "") -> List[Job]:
+    # BeautifulSoup on lxml, building only the job card subtrees.
+    try:
+        strainer = SoupStrainer('div', class_=CARD_CLASS)
+        job_cards = BeautifulSoup(content, 'lxml', parse_only=strainer).find_all('div', class_=CARD_CLASS)
+    except Exception as e:
+        raise RuntimeError(f"Parsing error while parsing response from {url}") from e
+    return _soup_cards_to_jobs(job_cards, job_name)
+
+
+LISTING_PARSERS: Dict[str, Callable[..., List[Job]]] = {
+    "soup": parse_listing_page_soup,
+    "soup_strainer": parse_listing_page_strained,
+    "lxml": parse_listing_page,
+}
+
+
+def fixture_files(fixture_dir: str = FIXTURE_DIR) -> List[str]:
+    return sorted(name for name in os.listdir(fixture_dir) if name.endswith(".html"))
+
+
+def load_fixture(name: str, fixture_dir: str = FIXTURE_DIR) -> bytes:
+    with open(os.path.join(fixture_dir, name), "rb") as f:
+        return f.read()
+
+
+def job_fields(job: Job) -> Dict[str, str]:
+    return {
+        "title": job.title, "company": job.company, "country": job.country, "city": job.city,
+        "area": job.area, "link": job.link, "job_type": job.job_type, "work_place": job.work_place,
+    }
+
+
+def check_fixtures(
+    parser: Callable[..., List[Job]] = parse_listing_page,
+    fixture_dir: str = FIXTURE_DIR,
+    reference: Callable[..., List[Job]] = parse_listing_page_soup
+) -> List[str]:
+    mismatches = []
+    for name in fixture_files(fixture_dir):
+        content = load_fixture(name, fixture_dir)
+        ours = [job_fields(job) for job in parser(content, "fixture")]
+        theirs = [job_fields(job) for job in reference(content, "fixture")]
+        if len(ours) != len(theirs):
+            mismatches.append(f"{name}: {len(ours)} cards, reference has {len(theirs)}")
+            continue
+        for i, (a, b) in enumerate(zip(ours, theirs)):
+            for field, value in a.items():
+                if value != b[field]:
+                    mismatches.append(f"{name} card {i} {field}: {value!r} reference={b[field]!r}")
+    return mismatches
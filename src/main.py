@@ -1,22 +1,29 @@
 import sys
 import os
+import threading
 import webbrowser
-from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QLabel, 
-                             QLineEdit, QPushButton, QFileDialog, QMessageBox, 
-                             QGraphicsOpacityEffect, QStackedWidget, QFrame, 
-                             QGridLayout, QScrollArea, QDialog, QHBoxLayout, 
-                             QGraphicsDropShadowEffect)
-from PyQt6.QtCore import (Qt, QPropertyAnimation, QEasingCurve, QTimer, QPoint, 
-                          QThread, pyqtSignal, QRectF)
-from PyQt6.QtGui import QFont, QCursor, QColor, QPainter, QPen, QLinearGradient
+
+import startup
+
+with startup.timed("import PyQt6"):
+    from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QLabel, 
+                                 QLineEdit, QPushButton, QFileDialog, QMessageBox, 
+                                 QGraphicsOpacityEffect, QStackedWidget, QFrame, 
+                                 QGridLayout, QScrollArea, QDialog, QHBoxLayout, 
+                                 QGraphicsDropShadowEffect)
+    from PyQt6.QtCore import (Qt, QPropertyAnimation, QEasingCurve, QTimer, QPoint, 
+                              QThread, pyqtSignal, QRectF)
+    from PyQt6.QtGui import QFont, QCursor, QColor, QPainter, QPen, QLinearGradient
 
 # --- Your Project Imports ---
 try:
-    from cv_extraction import extract_cv_data
-    from wuzzuf_scraper import scrape_jobs
-    from search_space import JobSearchSpace
-    from search_algorithms import hill_climbing, simulated_annealing, local_beam_search, tabu_search
-    from job import Job
+    with startup.timed("import backend"):
+        from cv_extraction import extract_cv_data
+        from job_db import DB_ONLY, JobDatabase
+        from pipeline import stream_search_space
+        from portfolio import run_portfolio
+        from job import Job
+        import similarities
 except ImportError:
     # Dummy Job class for UI testing if files are missing
     class Job:
@@ -149,16 +156,18 @@ class JobSearchWorker(QThread):
 
     def run(self):
         # Your specific backend logic
-        scrapped_list = scrape_jobs(self.job_title, 2)
         extracted_cv = extract_cv_data(self.cv_path)
-        search_space = JobSearchSpace(scrapped_list, extracted_cv)
 
-        # Run all algorithms
-        results = []
-        results.extend(hill_climbing(search_space))
-        results.extend(simulated_annealing(search_space))
-        results.extend(local_beam_search(search_space))
-        results.extend(tabu_search(search_space))
+        # Jobs are scored in micro-batches while scraping continues. Fresh jobs come from the
+        # local store; JOB_RECOMMENDER_DB_ONLY=1 runs use only the store.
+        with JobDatabase() as db:
+            search_space, timings = stream_search_space(
+                self.job_title, extracted_cv, 2, db=db, offline=DB_ONLY
+            )
+        print(f"Search pipeline: {timings.report()}")
+
+        # Seeded restarts of all algorithms; small scrapes run in-process, larger ones in a spawn pool (no Qt fork)
+        results = run_portfolio(search_space, k=8, mp_context="spawn").jobs
 
         # Filter unique results and return top 4
         unique_jobs = list({job.link: job for job in results if job.link != "N/A"}.values())
@@ -495,8 +504,24 @@ class CareerApp(QWidget):
         dialog = JobDetailDialog(job, self)
         dialog.exec()
 
+def start_model_warm_up():
+    # The embedding model loads in the background while the user fills in the form.
+    if "similarities" not in globals():
+        return
+
+    warm_up_thread = similarities.warm_up()
+    if "--startup-report" in sys.argv:
+        def report():
+            warm_up_thread.join()
+            print(startup.startup_report())
+
+        threading.Thread(target=report, daemon=True).start()
+
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = CareerApp()
     window.show()
+    startup.mark("window shown")
+    QTimer.singleShot(0, start_model_warm_up)
     sys.exit(app.exec())
\ No newline at end of file
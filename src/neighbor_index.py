@@ -0,0 +1,345 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from job import Job
+from job_store import GrowableArray
+
+
+SKILL_WEIGHT = 2
+CATEGORY_WEIGHT = 1
+CSR_ARRAYS = (
+    "skill_offsets", "skill_codes", "skill_bounds", "skill_postings",
+    "category_offsets", "category_codes", "category_bounds", "category_postings"
+)
+
+
+def _unique_per_row(offsets: np.ndarray, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    n_rows = len(offsets) - 1
+    owners = np.repeat(np.arange(n_rows, dtype=np.int64), np.diff(offsets))
+    order = np.lexsort((codes, owners))
+    owners, codes = owners[order], codes[order]
+
+    keep = np.ones(len(codes), dtype=bool)
+    keep[1:] = (owners[1:] != owners[:-1]) | (codes[1:] != codes[:-1])
+    owners, codes = owners[keep], codes[keep].astype(np.int32)
+    unique_offsets = np.searchsorted(owners, np.arange(n_rows + 1)).astype(np.int64)
+    return unique_offsets, codes
+
+
+def _postings(offsets: np.ndarray, codes: np.ndarray, n_codes: int) -> Tuple[np.ndarray, np.ndarray]:
+    owners = np.repeat(np.arange(len(offsets) - 1, dtype=np.int32), np.diff(offsets))
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(n_codes + 1)).astype(np.int64)
+    return bounds, owners[order]
+
+
+def _lowercase_codes(values: Sequence[str]) -> Tuple[Dict[str, int], np.ndarray]:
+    vocabulary: Dict[str, int] = {}
+    mapping = np.fromiter(
+        (vocabulary.setdefault(value.lower(), len(vocabulary)) for value in values),
+        dtype=np.int32,
+        count=len(values)
+    )
+    return vocabulary, mapping
+
+
+class NeighborIndex:
+    """Skill and category inverted indexes over a job store.
+
+    A job's neighbours are ranked by ``2 * shared skills + shared categories``
+    (ties broken by id), accumulated only over the posting lists of its own
+    skills and categories. Per-job sets and postings are CSR arrays; jobs added
+    later go to small overflow lists until the next ``compact``.
+    """
+
+    def __init__(
+        self,
+        skill_offsets: np.ndarray,
+        skill_codes: np.ndarray,
+        category_offsets: np.ndarray,
+        category_codes: np.ndarray,
+        skill_vocabulary: Dict[str, int],
+        category_vocabulary: Dict[str, int]
+    ):
+        self.skill_vocabulary = skill_vocabulary
+        self.category_vocabulary = category_vocabulary
+        self.removed = GrowableArray(np.bool_)
+        self._build(skill_offsets, skill_codes, category_offsets, category_codes)
+        self.removed.extend(np.zeros(self.size, dtype=np.bool_))
+        self.removed_count = 0
+        # k -> (table, known): row i of ``table`` is job i's ranked neighbours, right-padded with -1, valid where
+        # ``known[i]``. ``_padded`` holds jobs whose lists needed zero-overlap padding.
+        self._memo: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._padded: Set[int] = set()
+
+    def _build(self, skill_offsets, skill_codes, category_offsets, category_codes) -> None:
+        self.size = self.base_size = len(skill_offsets) - 1
+        self.skill_offsets, self.skill_codes = _unique_per_row(skill_offsets, skill_codes)
+        self.category_offsets, self.category_codes = _unique_per_row(category_offsets, category_codes)
+        self.skill_bounds, self.skill_postings = _postings(self.skill_offsets, self.skill_codes, len(self.skill_vocabulary))
+        self.category_bounds, self.category_postings = _postings(
+            self.category_offsets, self.category_codes, len(self.category_vocabulary)
+        )
+        self._extra_skills: List[np.ndarray] = []
+        self._extra_categories: List[np.ndarray] = []
+        self._extra_skill_postings: Dict[int, List[int]] = {}
+        self._extra_category_postings: Dict[int, List[int]] = {}
+
+    @classmethod
+    def from_jobs(cls, jobs: Sequence[Job]) -> "NeighborIndex":
+        skill_vocabulary: Dict[str, int] = {}
+        category_vocabulary: Dict[str, int] = {}
+        skill_codes = [skill_vocabulary.setdefault(s.lower(), len(skill_vocabulary)) for job in jobs for s in job.skills]
+        category_codes = [
+            category_vocabulary.setdefault(c.lower(), len(category_vocabulary)) for job in jobs for c in job.categories
+        ]
+        skill_offsets = np.concatenate(([0], np.cumsum([len(job.skills) for job in jobs], dtype=np.int64)))
+        category_offsets = np.concatenate(([0], np.cumsum([len(job.categories) for job in jobs], dtype=np.int64)))
+        return cls(
+            skill_offsets.astype(np.int64), np.array(skill_codes, dtype=np.int32),
+            category_offsets.astype(np.int64), np.array(category_codes, dtype=np.int32),
+            skill_vocabulary, category_vocabulary
+        )
+
+    @classmethod
+    def from_store(cls, store) -> "NeighborIndex":
+        # Skills and categories share the store's string pool; lowercase it once.
+        vocabulary, lowered = _lowercase_codes(store.pool.values)
+        index = cls(
+            store.skill_offsets.view(), lowered[store.skill_codes.view()],
+            store.category_offsets.view(), lowered[store.category_codes.view()],
+            vocabulary, dict(vocabulary)
+        )
+        for job_id in np.flatnonzero(store.removed.view()):
+            index.remove(int(job_id))
+        return index
+
+    def copy(self) -> "NeighborIndex":
+        # The CSR arrays are only ever replaced, never written, so the copy shares them.
+        clone = NeighborIndex.__new__(NeighborIndex)
+        clone.__dict__.update(self.__dict__)
+        clone.skill_vocabulary = dict(self.skill_vocabulary)
+        clone.category_vocabulary = dict(self.category_vocabulary)
+        clone.removed = self.removed.copy()
+        clone._extra_skills = list(self._extra_skills)
+        clone._extra_categories = list(self._extra_categories)
+        clone._extra_skill_postings = {code: list(ids) for code, ids in self._extra_skill_postings.items()}
+        clone._extra_category_postings = {code: list(ids) for code, ids in self._extra_category_postings.items()}
+        clone._memo = {k: (table.copy(), known.copy()) for k, (table, known) in self._memo.items()}
+        clone._padded = set(self._padded)
+        return clone
+
+    def _job_skills(self, job_id: int) -> np.ndarray:
+        if job_id < self.base_size:
+            return self.skill_codes[self.skill_offsets[job_id]:self.skill_offsets[job_id + 1]]
+        return self._extra_skills[job_id - self.base_size]
+
+    def _job_categories(self, job_id: int) -> np.ndarray:
+        if job_id < self.base_size:
+            return self.category_codes[self.category_offsets[job_id]:self.category_offsets[job_id + 1]]
+        return self._extra_categories[job_id - self.base_size]
+
+    def _skill_posting(self, code: int) -> np.ndarray:
+        base = self.skill_postings[self.skill_bounds[code]:self.skill_bounds[code + 1]] \
+            if code + 1 < len(self.skill_bounds) else self.skill_postings[:0]
+        extra = self._extra_skill_postings.get(code)
+        return np.concatenate((base, extra)) if extra else base
+
+    def _category_posting(self, code: int) -> np.ndarray:
+        base = self.category_postings[self.category_bounds[code]:self.category_bounds[code + 1]] \
+            if code + 1 < len(self.category_bounds) else self.category_postings[:0]
+        extra = self._extra_category_postings.get(code)
+        return np.concatenate((base, extra)) if extra else base
+
+    def _invalidate_around(self, job_ids: Sequence[int]) -> None:
+        # Only memoized lists can go stale, so an index built job by job does no work here.
+        if not self._memo:
+            return
+        skill_codes: Set[int] = set()
+        category_codes: Set[int] = set()
+        for job_id in job_ids:
+            skill_codes.update(self._job_skills(job_id).tolist())
+            category_codes.update(self._job_categories(job_id).tolist())
+
+        affected = self._padded.union(job_ids)
+        memoized = set()
+        for _, known in self._memo.values():
+            memoized.update(np.flatnonzero(known).tolist())
+        for other in memoized:
+            if not skill_codes.isdisjoint(self._job_skills(other).tolist()) \
+                    or not category_codes.isdisjoint(self._job_categories(other).tolist()):
+                affected.add(other)
+        stale = np.array(sorted(affected), dtype=np.int64)
+        for _, known in self._memo.values():
+            known[stale[stale < len(known)]] = False
+        self._padded.clear()
+
+    def add(self, skills: Iterable[str], categories: Iterable[str]) -> int:
+        return self.add_many([skills], [categories])[0]
+
+    def add_many(self, skill_lists: Sequence[Iterable[str]], category_lists: Sequence[Iterable[str]]) -> List[int]:
+        ids = list(range(self.size, self.size + len(skill_lists)))
+        for job_id, skills, categories in zip(ids, skill_lists, category_lists):
+            skill_codes = np.array(sorted({
+                self.skill_vocabulary.setdefault(s.lower(), len(self.skill_vocabulary)) for s in skills
+            }), dtype=np.int32)
+            category_codes = np.array(sorted({
+                self.category_vocabulary.setdefault(c.lower(), len(self.category_vocabulary)) for c in categories
+            }), dtype=np.int32)
+
+            self._extra_skills.append(skill_codes)
+            self._extra_categories.append(category_codes)
+            for code in skill_codes.tolist():
+                self._extra_skill_postings.setdefault(code, []).append(job_id)
+            for code in category_codes.tolist():
+                self._extra_category_postings.setdefault(code, []).append(job_id)
+        self.removed.extend(np.zeros(len(ids), dtype=np.bool_))
+        self.size += len(ids)
+
+        self._invalidate_around(ids)
+        if len(self._extra_skills) > max(1024, self.base_size):
+            self.compact()
+        return ids
+
+    def remove(self, job_id: int) -> None:
+        removed = self.removed.view()
+        if removed[job_id]:
+            return
+        removed[job_id] = True
+        self.removed_count += 1
+        self._invalidate_around([job_id])
+
+    def compact(self) -> None:
+        skill_sets = [self._job_skills(i) for i in range(self.size)]
+        category_sets = [self._job_categories(i) for i in range(self.size)]
+        self._build(*_to_csr(skill_sets), *_to_csr(category_sets))
+
+    def _table(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        table, known = self._memo.get(k, (np.zeros((0, k), dtype=np.int64), np.zeros(0, dtype=np.bool_)))
+        if len(known) < self.size:
+            capacity = max(self.size, 2 * len(known))
+            grown = np.full((capacity, k), -1, dtype=np.int64)
+            grown[:len(table)] = table
+            seen = np.zeros(capacity, dtype=np.bool_)
+            seen[:len(known)] = known
+            table, known = grown, seen
+        self._memo[k] = (table, known)
+        return table, known
+
+    def neighbor_rows(self, job_ids: Sequence[int], k: int = 5) -> np.ndarray:
+        # (len(job_ids), k) neighbour table right-padded with -1; only rows not memoized yet are ranked.
+        ids = np.asarray(job_ids, dtype=np.int64)
+        table, known = self._table(k)
+        for job_id in np.unique(ids[~known[ids]]).tolist():
+            ranked = self._rank(self._job_skills(job_id), self._job_categories(job_id), k, exclude=job_id)
+            table[job_id] = -1
+            table[job_id, :len(ranked)] = ranked
+            known[job_id] = True
+        return table[ids]
+
+    def neighbors(self, job_id: int, k: int = 5) -> np.ndarray:
+        row = self.neighbor_rows([job_id], k)[0]
+        return row[row >= 0]
+
+    def neighbors_many(self, job_ids: Sequence[int], k: int = 5) -> np.ndarray:
+        # Concatenated neighbour lists, in the order of ``job_ids``: one gather over the memo table.
+        flat = self.neighbor_rows(job_ids, k).ravel()
+        return flat[flat >= 0]
+
+    def memoized(self, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        # Memoized lists for ``k`` as ids plus a (n, k) table right-padded with -1.
+        table, known = self._table(k)
+        ids = np.flatnonzero(known[:self.size]).astype(np.int64)
+        return ids, table[ids].astype(np.int32)
+
+    def seed(self, ids: np.ndarray, rows: np.ndarray, k: int = 5) -> None:
+        table, known = self._table(k)
+        table[ids] = rows
+        known[ids] = True
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        # Flat CSR arrays and the removed mask, enough for ``from_arrays`` to rebuild a read-only copy.
+        if self._extra_skills:
+            self.compact()
+        arrays = {name: getattr(self, name) for name in CSR_ARRAYS}
+        arrays["removed"] = self.removed.view()
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "NeighborIndex":
+        # Ranks neighbours of indexed jobs only: the vocabularies stay empty, so ``query`` and ``add`` don't apply.
+        index = cls.__new__(cls)
+        index.skill_vocabulary = {}
+        index.category_vocabulary = {}
+        for name in CSR_ARRAYS:
+            setattr(index, name, arrays[name])
+        index.size = index.base_size = len(index.skill_offsets) - 1
+        index._extra_skills, index._extra_categories = [], []
+        index._extra_skill_postings, index._extra_category_postings = {}, {}
+        index.removed = GrowableArray(np.bool_)
+        index.removed.extend(arrays["removed"])
+        index.removed_count = int(arrays["removed"].sum())
+        index._memo, index._padded = {}, set()
+        return index
+
+    def query(self, skills: Iterable[str], categories: Iterable[str], k: int = 5) -> np.ndarray:
+        skill_codes = {self.skill_vocabulary[s.lower()] for s in skills if s.lower() in self.skill_vocabulary}
+        category_codes = {
+            self.category_vocabulary[c.lower()] for c in categories if c.lower() in self.category_vocabulary
+        }
+        return self._rank(sorted(skill_codes), sorted(category_codes), k)
+
+    def _rank(self, skill_codes, category_codes, k: int, exclude: Optional[int] = None) -> np.ndarray:
+        if k <= 0 or self.size == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        # Overlap counts via bincount over the concatenated postings; O(postings + size), no sort.
+        counts = np.zeros(self.size, dtype=np.int64)
+        if len(skill_codes):
+            skill_hits = np.concatenate([self._skill_posting(c) for c in skill_codes])
+            counts += SKILL_WEIGHT * np.bincount(skill_hits, minlength=self.size)
+        if len(category_codes):
+            category_hits = np.concatenate([self._category_posting(c) for c in category_codes])
+            counts += CATEGORY_WEIGHT * np.bincount(category_hits, minlength=self.size)
+        candidates = np.flatnonzero(counts)
+        scores = counts[candidates]
+
+        removed = self.removed.view()
+        keep = ~removed[candidates]
+        if exclude is not None:
+            keep &= candidates != exclude
+        candidates, scores = candidates[keep].astype(np.int64), scores[keep]
+
+        if len(candidates) > k:
+            # Higher overlap first, then lower id, as one integer sort key.
+            keys = -scores.astype(np.int64) * (self.size + 1) + candidates
+            top = np.argpartition(keys, k - 1)[:k]
+            top = top[np.argsort(keys[top])]
+            return candidates[top]
+
+        ranked = candidates[np.lexsort((candidates, -scores))]
+        available = self.size - self.removed_count - (exclude is not None and not removed[exclude])
+        missing = min(k, available) - len(ranked)
+        if missing <= 0:
+            return ranked
+
+        # Fewer than k overlapping jobs: pad with zero-overlap jobs in id order.
+        if exclude is not None:
+            self._padded.add(exclude)
+        taken = set(ranked.tolist())
+        if exclude is not None:
+            taken.add(exclude)
+        padding = []
+        for job_id in range(self.size):
+            if job_id not in taken and not removed[job_id]:
+                padding.append(job_id)
+                if len(padding) == missing:
+                    break
+        return np.concatenate((ranked, np.array(padding, dtype=np.int64)))
+
+
+def _to_csr(code_sets: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    offsets = np.concatenate(([0], np.cumsum([len(codes) for codes in code_sets], dtype=np.int64))).astype(np.int64)
+    codes = np.concatenate(code_sets).astype(np.int32) if len(code_sets) else np.zeros(0, dtype=np.int32)
+    return offsets, codes
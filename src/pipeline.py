@@ -0,0 +1,125 @@
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+from cv_extraction import CVData
+from job import Job
+from job_db import JobDatabase
+from search_space import JobSearchSpace
+from wuzzuf_scraper import iter_scrape_jobs
+
+
+BATCH_SIZE = 16
+MAX_BATCH_WAIT = 0.25
+_DONE = object()
+
+
+@dataclass
+class PipelineTimings:
+    """Seconds since the pipeline started, plus time spent scoring.
+
+    ``first_job``/``last_job`` are when the producer received jobs from the
+    scraper; ``listings`` and ``details`` are when those scrape stages ended.
+    """
+    first_job: float = 0.0
+    last_job: float = 0.0
+    listings: float = 0.0
+    details: float = 0.0
+    scraped: float = 0.0
+    scoring: float = 0.0
+    ready: float = 0.0
+    jobs: int = 0
+    batches: int = 0
+    started: float = field(default_factory=time.perf_counter, repr=False)
+
+    def mark(self, stage: str) -> None:
+        setattr(self, stage, time.perf_counter() - self.started)
+
+    @property
+    def tail(self) -> float:
+        # How long the space took to be ready after the scraper finished.
+        return self.ready - self.scraped
+
+    def report(self) -> str:
+        parts = [f"{name}={value:.2f}s" if isinstance(value, float) else f"{name}={value}"
+                 for name, value in asdict(self).items() if name != "started"]
+        return " ".join(parts + [f"tail={self.tail:.2f}s"])
+
+
+def _produce(jobs: Iterable[Job], out: queue.Queue, timings: PipelineTimings) -> None:
+    try:
+        for job in jobs:
+            if not timings.jobs:
+                timings.mark("first_job")
+            timings.mark("last_job")
+            timings.jobs += 1
+            out.put(job)
+    except Exception as e:
+        out.put(e)
+    finally:
+        timings.mark("scraped")
+        out.put(_DONE)
+
+
+def _next_batch(source: queue.Queue, batch_size: int, max_wait: float) -> Tuple[List[Job], bool]:
+    # Blocks for the first job, then gathers more for up to ``max_wait`` seconds.
+    batch: List[Job] = []
+    deadline = None
+    while len(batch) < batch_size:
+        try:
+            item = source.get(timeout=None if deadline is None else max(0.0, deadline - time.perf_counter()))
+        except queue.Empty:
+            break
+        if item is _DONE:
+            return batch, True
+        if isinstance(item, Exception):
+            raise item
+        batch.append(item)
+        if deadline is None:
+            deadline = time.perf_counter() + max_wait
+    return batch, False
+
+
+def build_search_space(
+    jobs: Iterable[Job],
+    cv_data: CVData,
+    batch_size: int = BATCH_SIZE,
+    max_wait: float = MAX_BATCH_WAIT,
+    timings: Optional[PipelineTimings] = None
+) -> Tuple[JobSearchSpace, PipelineTimings]:
+    # Scores micro-batches while a producer thread keeps pulling from ``jobs``.
+    timings = timings or PipelineTimings()
+    source: queue.Queue = queue.Queue()
+    producer = threading.Thread(target=_produce, args=(jobs, source, timings), daemon=True)
+    producer.start()
+
+    space = JobSearchSpace([], cv_data)
+    done = False
+    while not done:
+        batch, done = _next_batch(source, batch_size, max_wait)
+        if not batch:
+            continue
+
+        scoring_start = time.perf_counter()
+        space.add_jobs(batch)
+        timings.scoring += time.perf_counter() - scoring_start
+        timings.batches += 1
+
+    producer.join()
+    timings.mark("ready")
+    return space, timings
+
+
+def stream_search_space(
+    job_name: str,
+    cv_data: CVData,
+    page_limit: int = 1,
+    db: Optional[JobDatabase] = None,
+    offline: bool = False,
+    batch_size: int = BATCH_SIZE
+) -> Tuple[JobSearchSpace, PipelineTimings]:
+    timings = PipelineTimings()
+    jobs = iter_scrape_jobs(job_name, page_limit, db, offline, on_stage=timings.mark)
+    return build_search_space(jobs, cv_data, batch_size, timings=timings)
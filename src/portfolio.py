@@ -0,0 +1,295 @@
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from job import Job
+from neighbor_index import NeighborIndex
+from search_algorithms import hill_climbing, local_beam_search, simulated_annealing, tabu_search
+from search_engine import SearchBudget
+from search_space import JobSearchSpace
+
+
+ALGORITHMS: Dict[str, Callable] = {
+    "hill_climbing": hill_climbing,
+    "simulated_annealing": simulated_annealing,
+    "local_beam_search": local_beam_search,
+    "tabu_search": tabu_search,
+}
+NEIGHBOR_K = 5
+# Below this many jobs the restarts run sequentially in the calling process.
+IN_PROCESS_MAX_JOBS = 2000
+
+
+class SharedSearchSpace:
+    """Read-only search space over arrays living in shared memory.
+
+    Mirrors the id-based ``JobSearchSpace`` methods the algorithms use.
+    Neighbour lists are ranked on first use from the shared inverted indexes
+    and memoized per worker. ``materialize`` returns the ids themselves; the
+    parent process turns the merged ids back into ``Job`` objects.
+    """
+
+    def __init__(self, scores: np.ndarray, neighbor_index: NeighborIndex, alive: np.ndarray):
+        self.scores = scores
+        self.neighbor_index = neighbor_index
+        self.alive = alive
+        self.all_alive = len(alive) == len(scores)
+
+    def size(self) -> int:
+        return len(self.alive)
+
+    def score(self, job_id: int) -> float:
+        return float(self.scores[job_id])
+
+    def evaluate(self, ids) -> int:
+        return 0
+
+    def random_id(self) -> int:
+        if self.all_alive:
+            return random.randrange(self.size())
+        return int(random.choice(self.alive))
+
+    def sample_ids(self, k: int) -> List[int]:
+        if self.all_alive:
+            return random.sample(range(self.size()), min(k, self.size()))
+        return [int(i) for i in random.sample(list(self.alive), min(k, self.size()))]
+
+    def neighbor_ids(self, job_id: int, k: int = 5) -> np.ndarray:
+        # Lists are ranked once at NEIGHBOR_K; shorter requests take a prefix of the same ranking.
+        return self.neighbor_index.neighbors(int(job_id), NEIGHBOR_K)[:k]
+
+    def neighbor_ids_many(self, job_ids: Sequence[int], k: int = 5) -> np.ndarray:
+        flat = self.neighbor_index.neighbor_rows(job_ids, NEIGHBOR_K)[:, :k].ravel()
+        return flat[flat >= 0]
+
+    def materialize(self, ids: Sequence[int]) -> List[int]:
+        return [int(i) for i in ids]
+
+
+@dataclass
+class PortfolioResult:
+    jobs: List[Job]
+    ids: List[int]
+    scores: List[float]
+    restarts: int = 0
+    improvements: int = 0
+    elapsed: float = 0.0
+    stop_reason: str = "completed"
+    per_algorithm: Dict[str, int] = field(default_factory=dict)
+
+
+# Worker-side state, attached once per process by ``_attach``.
+_worker_space: Optional[SharedSearchSpace] = None
+_worker_blocks: List[shared_memory.SharedMemory] = []
+
+
+def _share(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, Tuple[str, tuple, str]]:
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def _open(spec: Tuple[str, tuple, str]) -> np.ndarray:
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    _worker_blocks.append(block)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _attach(scores_spec, index_specs: Dict[str, tuple], alive_spec, memo_ids_spec, memo_rows_spec) -> None:
+    global _worker_space
+    try:
+        neighbor_index = NeighborIndex.from_arrays({name: _open(spec) for name, spec in index_specs.items()})
+    except FileNotFoundError:
+        # The parent already stopped and released the blocks; this late worker gets no tasks.
+        return
+    neighbor_index.seed(_open(memo_ids_spec), _open(memo_rows_spec), NEIGHBOR_K)
+    _worker_space = SharedSearchSpace(_open(scores_spec), neighbor_index, _open(alive_spec))
+
+
+def _run_restart(algorithm: str, seed: int) -> Tuple[str, int, List[int]]:
+    random.seed(seed)
+    return algorithm, seed, ALGORITHMS[algorithm](_worker_space)
+
+
+def _merge(found: Dict[int, float], k: int) -> List[Tuple[int, float]]:
+    return sorted(found.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+
+class _Tally:
+    """Merges finished restarts into one top-k and tracks convergence."""
+
+    def __init__(self, scores: np.ndarray, k: int, patience: int, algorithms: Sequence[str]):
+        self.scores = scores
+        self.k = k
+        self.patience = patience
+        self.found: Dict[int, float] = {}
+        self.per_algorithm = {name: 0 for name in algorithms}
+        self.best_top: Tuple[int, ...] = ()
+        self.completed = self.improvements = self.stale = 0
+
+    def add(self, name: str, ids: Sequence[int]) -> None:
+        self.completed += 1
+        self.per_algorithm[name] += 1
+        for job_id in ids:
+            self.found[job_id] = float(self.scores[job_id])
+
+        # A restart improves the portfolio when it changes the merged top-k (and so any better best score).
+        top = tuple(job_id for job_id, _ in _merge(self.found, self.k))
+        if top != self.best_top:
+            self.best_top = top
+            self.improvements += 1
+            self.stale = 0
+        else:
+            self.stale += 1
+
+    @property
+    def converged(self) -> bool:
+        return self.stale >= self.patience
+
+
+class _IdView:
+    # A JobSearchSpace whose ``materialize`` returns ids, like ``SharedSearchSpace``; ``id_of`` can't map
+    # jobs without a link back to their ids.
+    def __init__(self, space: JobSearchSpace):
+        self.space = space
+
+    def __getattr__(self, name):
+        return getattr(self.space, name)
+
+    def materialize(self, ids: Sequence[int]) -> List[int]:
+        return [int(i) for i in ids]
+
+
+def _run_in_process(
+    space: JobSearchSpace,
+    tasks: Sequence[Tuple[str, int]],
+    tally: _Tally,
+    remaining: Callable[[], float]
+) -> str:
+    # Small spaces finish a restart in milliseconds, far less than starting a worker process.
+    view = _IdView(space)
+    state = random.getstate()
+    try:
+        for i, (name, task_seed) in enumerate(tasks):
+            if remaining() <= 0:
+                return "deadline"
+            random.seed(task_seed)
+            ids = ALGORITHMS[name](view, budget=SearchBudget(max_ms=remaining() * 1000))
+            tally.add(name, ids)
+            if i + 1 < len(tasks) and tally.converged:
+                return "converged"
+    finally:
+        random.setstate(state)
+    return "completed"
+
+
+def _run_in_pool(
+    space: JobSearchSpace,
+    scores: np.ndarray,
+    tasks: Sequence[Tuple[str, int]],
+    tally: _Tally,
+    remaining: Callable[[], float],
+    max_workers: Optional[int],
+    mp_context: Optional[str]
+) -> str:
+    blocks = []
+
+    def share(array: np.ndarray) -> tuple:
+        block, spec = _share(array)
+        blocks.append(block)
+        return spec
+
+    stop_reason = "completed"
+    executor = None
+    try:
+        # Workers rank neighbours on demand from the shared indexes, starting from the lists already memoized here.
+        memo_ids, memo_rows = space.neighbor_index.memoized(NEIGHBOR_K)
+        initargs = (
+            share(scores),
+            {name: share(array) for name, array in space.neighbor_index.arrays().items()},
+            share(space.alive_ids().astype(np.int64)),
+            share(memo_ids),
+            share(memo_rows)
+        )
+        if remaining() <= 0:
+            return "deadline"
+
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers or min(len(tasks), os.cpu_count() or 1) or 1,
+            initializer=_attach,
+            initargs=initargs,
+            mp_context=multiprocessing.get_context(mp_context) if mp_context else None
+        )
+        pending = {executor.submit(_run_restart, name, task_seed) for name, task_seed in tasks}
+        while pending:
+            if remaining() <= 0:
+                stop_reason = "deadline"
+                break
+
+            done, pending = wait(pending, timeout=remaining(), return_when=FIRST_COMPLETED)
+            for future in done:
+                name, _, ids = future.result()
+                tally.add(name, ids)
+
+            if pending and tally.converged:
+                stop_reason = "converged"
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=stop_reason == "completed", cancel_futures=True)
+        for block in blocks:
+            block.close()
+            block.unlink()
+    return stop_reason
+
+
+def run_portfolio(
+    space: JobSearchSpace,
+    k: int = 4,
+    restarts: int = 8,
+    algorithms: Sequence[str] = tuple(ALGORITHMS),
+    max_workers: Optional[int] = None,
+    deadline: float = 10.0,
+    patience: int = 16,
+    seed: int = 0,
+    mp_context: Optional[str] = None,
+    in_process_below: int = IN_PROCESS_MAX_JOBS
+) -> PortfolioResult:
+    # ``deadline`` covers the whole call, setup included.
+    start = time.perf_counter()
+    if space.size() == 0:
+        return PortfolioResult(jobs=[], ids=[], scores=[])
+
+    def remaining() -> float:
+        return deadline - (time.perf_counter() - start)
+
+    # Restarts need every score up front; a lazy space is evaluated in one batch here.
+    space.evaluate(space.alive_ids())
+    scores = np.ascontiguousarray(space.scores, dtype=np.float64)
+    tasks = [(name, seed * 1_000_003 + r) for r in range(restarts) for name in algorithms]
+    tally = _Tally(scores, k, patience, algorithms)
+
+    if space.size() < in_process_below or max_workers == 1:
+        stop_reason = _run_in_process(space, tasks, tally, remaining)
+    else:
+        stop_reason = _run_in_pool(space, scores, tasks, tally, remaining, max_workers, mp_context)
+
+    merged = _merge(tally.found, k)
+    return PortfolioResult(
+        jobs=space.materialize([job_id for job_id, _ in merged]),
+        ids=[job_id for job_id, _ in merged],
+        scores=[score for _, score in merged],
+        restarts=tally.completed,
+        improvements=tally.improvements,
+        elapsed=time.perf_counter() - start,
+        stop_reason=stop_reason,
+        per_algorithm=tally.per_algorithm
+    )
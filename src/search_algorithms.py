@@ -1,183 +1,226 @@
 import random
 import math
-from typing import List, Dict, Set
+from collections import deque
+from typing import Dict, Iterable, List
+
+import numpy as np
 
 from job import Job
+from search_engine import UNLIMITED, SearchBudget, SearchEngine, StepHook, Strategy, top_k_indices, unique_in_order
 from search_space import JobSearchSpace
 
 
-def hill_climbing(space: JobSearchSpace, max_no_improve: int = 10) -> List[Job]:
-    current = space.get_random_job()
-    current_score = space.get_score(current)
-    
-    visited: Dict[int, float] = {id(current): current_score}
-    no_improve_count = 0
-    
-    while no_improve_count < max_no_improve:
-        neighbors = space.get_neighbors(current, k=5)
-        
+class HillClimbing(Strategy):
+    def __init__(self, max_no_improve: int = 10):
+        self.max_no_improve = max_no_improve
+
+    def start(self, engine: SearchEngine) -> None:
+        self.current = engine.space.random_id()
+        self.current_score = engine.score(self.current)
+        self.no_improve_count = 0
+
+    def step(self, engine: SearchEngine) -> bool:
+        if self.no_improve_count >= self.max_no_improve:
+            return False
+
+        neighbors = engine.affordable(engine.neighbors(self.current, k=5))
         if not neighbors:
-            break
-        
+            return False
+
         best_neighbor = None
-        best_neighbor_score = current_score
-        
+        best_neighbor_score = self.current_score
+        engine.evaluate(neighbors)
+
         for neighbor in neighbors:
-            score = space.get_score(neighbor)
-            visited[id(neighbor)] = score
-            
+            score = engine.score(neighbor)
             if score > best_neighbor_score:
                 best_neighbor = neighbor
                 best_neighbor_score = score
-        
-        if best_neighbor is not None and best_neighbor_score > current_score:
-            current = best_neighbor
-            current_score = best_neighbor_score
-            no_improve_count = 0
+
+        if best_neighbor is not None and best_neighbor_score > self.current_score:
+            self.current = best_neighbor
+            self.current_score = best_neighbor_score
+            self.no_improve_count = 0
         else:
-            no_improve_count += 1
-    
-    visited_jobs = [(job, visited[id(job)]) for job in space.jobs if id(job) in visited]
-    visited_jobs.sort(key=lambda x: x[1], reverse=True)
-    return [job for job, _ in visited_jobs[:3]]
+            self.no_improve_count += 1
+        return True
+
+
+class SimulatedAnnealing(Strategy):
+    def __init__(self, initial_temp: float = 100.0, cooling_rate: float = 0.95, min_temp: float = 0.01):
+        self.initial_temp = initial_temp
+        self.cooling_rate = cooling_rate
+        self.min_temp = min_temp
+
+    def start(self, engine: SearchEngine) -> None:
+        self.current = engine.space.random_id()
+        self.current_score = engine.score(self.current)
+        self.temp = self.initial_temp
+
+    def step(self, engine: SearchEngine) -> bool:
+        if self.temp <= self.min_temp:
+            return False
+
+        neighbors = engine.affordable(engine.neighbors(self.current, k=5))
+        if not neighbors:
+            return False
+
+        neighbor = random.choice(neighbors)
+        neighbor_score = engine.score(neighbor)
+        delta = neighbor_score - self.current_score
+
+        if delta > 0 or random.random() < math.exp(delta / self.temp):
+            self.current = neighbor
+            self.current_score = neighbor_score
+
+        self.temp *= self.cooling_rate
+        return True
+
+
+class LocalBeamSearch(Strategy):
+    def __init__(self, k: int = 5, max_iter: int = 50):
+        self.k = k
+        self.max_iter = max_iter
+
+    def start(self, engine: SearchEngine) -> None:
+        self.beam = engine.affordable(np.asarray(engine.space.sample_ids(self.k), dtype=np.int64))
+        self.beam_scores = engine.score_many(self.beam)
+        self.iteration = 0
+
+    def step(self, engine: SearchEngine) -> bool:
+        if self.iteration >= self.max_iter:
+            engine.stop("max_iter")
+            return False
+        self.iteration += 1
+
+        # Every member's neighbours in one gather, then the beam itself; first occurrence wins.
+        expanded = np.concatenate((engine.neighbors_many(self.beam, k=3), self.beam))
+        candidates = engine.affordable(unique_in_order(expanded))
+        if len(candidates) == 0:
+            return False
+
+        scores = engine.score_many(candidates)
+        top = top_k_indices(scores, self.k)
+        new_beam, new_scores = candidates[top], scores[top]
+
+        # An unchanged beam would expand to the same candidates on every later iteration.
+        unchanged = np.array_equal(new_beam, self.beam)
+        self.beam, self.beam_scores = new_beam, new_scores
+        return not unchanged
+
+    def result(self, engine: SearchEngine) -> List[Job]:
+        return engine.space.materialize(self.beam[top_k_indices(self.beam_scores, 3)].tolist())
+
+
+class TabuList:
+    """Fixed-tenure FIFO of recent moves with O(1) membership."""
+
+    def __init__(self, tenure: int, initial: Iterable[int] = ()):
+        self.tenure = tenure
+        self.queue: deque = deque()
+        self.counts: Dict[int, int] = {}
+        for job_id in initial:
+            self.add(job_id)
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self.counts
+
+    def add(self, job_id: int) -> None:
+        self.queue.append(job_id)
+        self.counts[job_id] = self.counts.get(job_id, 0) + 1
+        if len(self.queue) > self.tenure:
+            expired = self.queue.popleft()
+            self.counts[expired] -= 1
+            if not self.counts[expired]:
+                del self.counts[expired]
+
+
+class TabuSearch(Strategy):
+    def __init__(self, max_iter: int = 50, tabu_tenure: int = 7):
+        self.max_iter = max_iter
+        self.tabu_tenure = tabu_tenure
+
+    def start(self, engine: SearchEngine) -> None:
+        self.current = engine.space.random_id()
+        self.current_score = engine.score(self.current)
+        self.tabu = TabuList(self.tabu_tenure, [self.current])
+        self.iteration = 0
+
+    def step(self, engine: SearchEngine) -> bool:
+        if self.iteration >= self.max_iter:
+            engine.stop("max_iter")
+            return False
+        self.iteration += 1
+
+        neighbors = engine.affordable(engine.neighbors(self.current, k=5))
+        if not neighbors:
+            return False
+
+        best_neighbor = None
+        best_neighbor_score = float('-inf')
+        non_tabu = [j for j in neighbors if j not in self.tabu]
+        engine.evaluate(non_tabu)
+
+        for neighbor in non_tabu:
+            score = engine.score(neighbor)
+            if score > best_neighbor_score:
+                best_neighbor = neighbor
+                best_neighbor_score = score
+
+        if best_neighbor is None:
+            best_neighbor = random.choice(non_tabu or neighbors)
+            best_neighbor_score = engine.score(best_neighbor)
+
+        self.current = best_neighbor
+        self.current_score = best_neighbor_score
+        self.tabu.add(self.current)
+        return True
+
+
+def run_strategy(
+    space: JobSearchSpace,
+    strategy: Strategy,
+    budget: SearchBudget = UNLIMITED,
+    hooks: Iterable[StepHook] = ()
+) -> List[Job]:
+    return SearchEngine(space, budget, hooks).run(strategy)
+
+
+def hill_climbing(
+    space: JobSearchSpace,
+    max_no_improve: int = 10,
+    budget: SearchBudget = UNLIMITED,
+    hooks: Iterable[StepHook] = ()
+) -> List[Job]:
+    return run_strategy(space, HillClimbing(max_no_improve), budget, hooks)
 
 
 def simulated_annealing(
     space: JobSearchSpace,
     initial_temp: float = 100.0,
     cooling_rate: float = 0.95,
-    min_temp: float = 0.01
+    min_temp: float = 0.01,
+    budget: SearchBudget = UNLIMITED,
+    hooks: Iterable[StepHook] = ()
 ) -> List[Job]:
-    current = space.get_random_job()
-    current_score = space.get_score(current)
-    
-    best = current
-    best_score = current_score
-    
-    visited: Dict[int, float] = {id(current): current_score}
-    temp = initial_temp
-    
-    while temp > min_temp:
-        neighbors = space.get_neighbors(current, k=5)
-        
-        if not neighbors:
-            break
-        
-        neighbor = random.choice(neighbors)
-        neighbor_score = space.get_score(neighbor)
-        visited[id(neighbor)] = neighbor_score
-        
-        delta = neighbor_score - current_score
-        
-        if delta > 0 or random.random() < math.exp(delta / temp):
-            current = neighbor
-            current_score = neighbor_score
-            
-            if current_score > best_score:
-                best = current
-                best_score = current_score
-        
-        temp *= cooling_rate
-    
-    visited_jobs = [(job, visited[id(job)]) for job in space.jobs if id(job) in visited]
-    visited_jobs.sort(key=lambda x: x[1], reverse=True)
-    return [job for job, _ in visited_jobs[:3]]
+    return run_strategy(space, SimulatedAnnealing(initial_temp, cooling_rate, min_temp), budget, hooks)
 
 
 def local_beam_search(
     space: JobSearchSpace,
     k: int = 5,
-    max_iter: int = 50
+    max_iter: int = 50,
+    budget: SearchBudget = UNLIMITED,
+    hooks: Iterable[StepHook] = ()
 ) -> List[Job]:
-    beam: List[Job] = random.sample(space.jobs, min(k, space.size()))
-    
-    for _ in range(max_iter):
-        all_candidates: List[Job] = []
-        seen_ids: Set[int] = set()
-        
-        for job in beam:
-            neighbors = space.get_neighbors(job, k=3)
-            for neighbor in neighbors:
-                if id(neighbor) not in seen_ids:
-                    all_candidates.append(neighbor)
-                    seen_ids.add(id(neighbor))
-        
-        for job in beam:
-            if id(job) not in seen_ids:
-                all_candidates.append(job)
-                seen_ids.add(id(job))
-        
-        if not all_candidates:
-            break
-        
-        all_candidates.sort(key=lambda j: space.get_score(j), reverse=True)
-        new_beam = all_candidates[:k]
-        
-        scores = [space.get_score(j) for j in new_beam]
-        if len(set(round(s, 1) for s in scores)) == 1:
-            beam = new_beam
-            break
-        
-        beam = new_beam
-    
-    beam.sort(key=lambda j: space.get_score(j), reverse=True)
-    return beam[:3]
+    return run_strategy(space, LocalBeamSearch(k, max_iter), budget, hooks)
 
 
 def tabu_search(
     space: JobSearchSpace,
     max_iter: int = 50,
-    tabu_tenure: int = 7
+    tabu_tenure: int = 7,
+    budget: SearchBudget = UNLIMITED,
+    hooks: Iterable[StepHook] = ()
 ) -> List[Job]:
-    current = space.get_random_job()
-    current_score = space.get_score(current)
-    
-    best = current
-    best_score = current_score
-    
-    visited: Dict[int, float] = {id(current): current_score}
-    tabu_list: List[int] = [id(current)]
-    
-    for _ in range(max_iter):
-        neighbors = space.get_neighbors(current, k=5)
-        
-        if not neighbors:
-            break
-        
-        best_neighbor = None
-        best_neighbor_score = float('-inf')
-        
-        for neighbor in neighbors:
-            if id(neighbor) in tabu_list:
-                continue
-            
-            score = space.get_score(neighbor)
-            visited[id(neighbor)] = score
-            
-            if score > best_neighbor_score:
-                best_neighbor = neighbor
-                best_neighbor_score = score
-        
-        if best_neighbor is None:
-            non_tabu = [j for j in neighbors if id(j) not in tabu_list]
-            if non_tabu:
-                best_neighbor = random.choice(non_tabu)
-                best_neighbor_score = space.get_score(best_neighbor)
-            else:
-                best_neighbor = random.choice(neighbors)
-                best_neighbor_score = space.get_score(best_neighbor)
-        
-        current = best_neighbor
-        current_score = best_neighbor_score
-        
-        tabu_list.append(id(current))
-        if len(tabu_list) > tabu_tenure:
-            tabu_list.pop(0)
-        
-        if current_score > best_score:
-            best = current
-            best_score = current_score
-    
-    visited_jobs = [(job, visited[id(job)]) for job in space.jobs if id(job) in visited]
-    visited_jobs.sort(key=lambda x: x[1], reverse=True)
-    return [job for job, _ in visited_jobs[:3]]
+    return run_strategy(space, TabuSearch(max_iter, tabu_tenure), budget, hooks)
@@ -0,0 +1,185 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from job import Job
+
+
+@dataclass(frozen=True)
+class SearchBudget:
+    max_evaluations: Optional[int] = None
+    max_ms: Optional[float] = None
+
+
+UNLIMITED = SearchBudget()
+
+StepHook = Callable[["SearchEngine"], None]
+
+
+class Strategy:
+    """One search algorithm driven by ``SearchEngine``.
+
+    ``start`` picks the initial state, ``step`` runs one iteration and returns
+    False once the strategy has converged (a strategy that hit its own
+    iteration cap calls ``engine.stop("max_iter")`` first), and ``result``
+    builds the answer.
+    """
+
+    def start(self, engine: "SearchEngine") -> None:
+        raise NotImplementedError
+
+    def step(self, engine: "SearchEngine") -> bool:
+        raise NotImplementedError
+
+    def result(self, engine: "SearchEngine") -> List[Job]:
+        return engine.best()
+
+
+class SearchEngine:
+    """Shared loop, bookkeeping and budget for the local search strategies.
+
+    Every score goes through ``score`` so the visited set, the evaluation
+    counter and the anytime ``best`` answer stay in one place. The budget is
+    checked between steps, and ``affordable`` cuts candidate lists (including
+    ``score_many`` batches) to the evaluations left, so neither a step nor
+    ``start`` overshoots ``max_evaluations``. Hooks run after every step and
+    may call ``stop``.
+    """
+
+    def __init__(self, space, budget: SearchBudget = UNLIMITED, hooks: Iterable[StepHook] = ()):
+        self.space = space
+        self.budget = budget
+        self.hooks: List[StepHook] = list(hooks)
+        self.visited: Dict[int, float] = {}
+        self.evaluations = 0
+        self.score_calls = 0
+        self.neighbor_calls = 0
+        self.steps = 0
+        self.stop_reason: Optional[str] = None
+        self._start = time.perf_counter()
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def add_hook(self, hook: StepHook) -> None:
+        self.hooks.append(hook)
+
+    def stop(self, reason: str = "stopped") -> None:
+        self.stop_reason = reason
+
+    def exhausted(self) -> bool:
+        if self.stop_reason is not None:
+            return True
+        if self.budget.max_evaluations is not None and self.evaluations >= self.budget.max_evaluations:
+            self.stop_reason = "max_evaluations"
+        elif self.budget.max_ms is not None and self.elapsed_ms >= self.budget.max_ms:
+            self.stop_reason = "max_ms"
+        return self.stop_reason is not None
+
+    def remaining_evaluations(self) -> Optional[int]:
+        if self.budget.max_evaluations is None:
+            return None
+        return max(0, self.budget.max_evaluations - self.evaluations)
+
+    def affordable(self, ids):
+        # ``ids`` in order, minus the unvisited ones past the evaluation budget; visited ids cost nothing.
+        remaining = self.remaining_evaluations()
+        if remaining is None:
+            return ids
+        keep = []
+        for i, job_id in enumerate(ids):
+            if int(job_id) in self.visited:
+                keep.append(i)
+            elif remaining:
+                keep.append(i)
+                remaining -= 1
+        if len(keep) == len(ids):
+            return ids
+        return ids[np.asarray(keep, dtype=np.int64)] if isinstance(ids, np.ndarray) else [ids[i] for i in keep]
+
+    def evaluate(self, ids: Iterable[int]) -> None:
+        self.space.evaluate(ids)
+
+    def score(self, job_id: int) -> float:
+        job_id = int(job_id)
+        self.score_calls += 1
+        score = self.visited.get(job_id)
+        if score is None:
+            score = self.space.score(job_id)
+            self.visited[job_id] = score
+            self.evaluations += 1
+        return score
+
+    def neighbors(self, job_id: int, k: int = 5) -> List[int]:
+        self.neighbor_calls += 1
+        return [int(n) for n in self.space.neighbor_ids(job_id, k)]
+
+    def score_many(self, ids: np.ndarray) -> np.ndarray:
+        # One batched evaluation; scores are read straight from the space's array. Callers pass ``affordable``
+        # ids, so this never goes over the budget.
+        self.space.evaluate(ids)
+        scores = self.space.scores[ids].astype(np.float64)
+        self.score_calls += len(ids)
+        for job_id, score in zip(ids.tolist(), scores.tolist()):
+            if job_id not in self.visited:
+                self.visited[job_id] = score
+                self.evaluations += 1
+        return scores
+
+    def neighbors_many(self, job_ids: Sequence[int], k: int = 5) -> np.ndarray:
+        # Counted per job, like ``neighbors``, so neighbour-call counts compare across strategies.
+        self.neighbor_calls += len(job_ids)
+        return np.asarray(self.space.neighbor_ids_many(job_ids, k), dtype=np.int64)
+
+    def best_ids(self, k: int = 3) -> List[int]:
+        ranked = sorted(list(self.visited.items()), key=lambda item: (-item[1], item[0]))
+        return [job_id for job_id, _ in ranked[:k]]
+
+    def best(self, k: int = 3) -> List[Job]:
+        return self.space.materialize(self.best_ids(k))
+
+    def counters(self) -> Dict[str, float]:
+        return {
+            "steps": self.steps,
+            "evaluations": self.evaluations,
+            "score_calls": self.score_calls,
+            "neighbor_calls": self.neighbor_calls,
+            "elapsed_ms": self.elapsed_ms,
+            "stop_reason": self.stop_reason,
+        }
+
+    def run(self, strategy: Strategy) -> List[Job]:
+        self._start = time.perf_counter()
+        # ``start`` scores at least one job, so a budget that allows none ends the run before it.
+        if self.exhausted():
+            return self.best()
+        strategy.start(self)
+        while not self.exhausted():
+            if not strategy.step(self):
+                # A step can also end because the budget ran out mid-step or the strategy hit max_iter.
+                if not self.exhausted():
+                    self.stop_reason = "converged"
+                break
+            self.steps += 1
+            for hook in self.hooks:
+                hook(self)
+        return strategy.result(self)
+
+
+def unique_in_order(ids: np.ndarray) -> np.ndarray:
+    _, first = np.unique(ids, return_index=True)
+    return ids[np.sort(first)]
+
+
+def top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    # Same as a stable descending sort cut to k (ties keep input order), but only entries >= the k-th value are sorted.
+    if k >= len(values):
+        return np.argsort(-values, kind="stable")
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    threshold = values[np.argpartition(-values, k - 1)[k - 1]]
+    candidates = np.flatnonzero(values >= threshold)
+    return candidates[np.argsort(-values[candidates], kind="stable")][:k]
@@ -1,53 +1,279 @@
 import random
-from typing import List, Dict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Union
 
-from job import Job
+import numpy as np
+
+from job import Job, has_link
+from job_store import JobStore
 from cv_extraction import CVData
-from similarities import calculate_similarity
+from neighbor_index import NeighborIndex
+from similarities import (DEFAULT_WEIGHTS, CVScorer, ScoreComponents, ScoreMatrix, ScoreWeights,
+                          batch_experience_similarity, batch_score_components, batch_score_matrix, encode_texts)
+
+
+ExperienceCurve = Callable[[float, np.ndarray], np.ndarray]
 
 
 class JobSearchSpace:
-    def __init__(self, jobs: List[Job], cv_data: CVData):
-        self.jobs = jobs
+    def __init__(
+        self,
+        jobs: Union[List[Job], JobStore],
+        cv_data: CVData,
+        components: Optional[ScoreComponents] = None,
+        weights: ScoreWeights = DEFAULT_WEIGHTS,
+        neighbor_index: Optional[NeighborIndex] = None,
+        lazy: bool = False
+    ):
+        self.store = jobs if isinstance(jobs, JobStore) else JobStore.from_jobs(jobs)
         self.cv_data = cv_data
-        self._scores: Dict[int, float] = {}
-        self._precompute_scores()
-    
-    def _precompute_scores(self) -> None:
-        for job in self.jobs:
-            self._scores[id(job)] = calculate_similarity(self.cv_data, job)
-    
+        self.weights = weights
+        # In lazy mode semantic and skill scores are computed on first touch; ``evaluated`` marks which are known.
+        self.lazy = lazy and components is None
+        self._scorer: Optional[CVScorer] = None
+        self.evaluated: Optional[np.ndarray] = None
+        if self.lazy:
+            self.components = self._unscored_components(0, len(self.store))
+            self.evaluated = np.zeros(len(self.store), dtype=bool)
+        else:
+            self.components = components if components is not None else self._precompute_scores()
+        self.scores = self.components.combine(self.weights)
+        self.neighbor_index = neighbor_index if neighbor_index is not None else NeighborIndex.from_store(self.store)
+        self._alive: Optional[np.ndarray] = None
+        # Set when the store and index are shared with sibling spaces; the first change copies them.
+        self._shared_store = False
+        self._mask_unscored()
+
+    @classmethod
+    def from_score_matrix(
+        cls,
+        jobs: Union[List[Job], JobStore],
+        cvs: Sequence[CVData],
+        matrix: Optional[ScoreMatrix] = None
+    ) -> List["JobSearchSpace"]:
+        store = jobs if isinstance(jobs, JobStore) else JobStore.from_jobs(jobs)
+        if matrix is None:
+            matrix = batch_score_matrix(cvs, store)
+        neighbor_index = NeighborIndex.from_store(store)
+        spaces = [
+            cls(store, cv, components=matrix.row(i), neighbor_index=neighbor_index)
+            for i, cv in enumerate(cvs)
+        ]
+        for space in spaces:
+            space._shared_store = True
+        return spaces
+
+    @classmethod
+    def from_index(cls, jobs: List[Job], cv_data: CVData, index, k: int = 500, nprobe: Optional[int] = None) -> "JobSearchSpace":
+        cv_embedding = encode_texts([cv_data.raw_text])[0]
+        ids, _ = index.search(cv_embedding, k=k, nprobe=nprobe)
+        return cls([jobs[i] for i in ids], cv_data)
+
+    def _precompute_scores(self) -> ScoreComponents:
+        return batch_score_components(self.cv_data, self.store)
+
+    def _unscored_components(self, start: int, stop: int) -> ScoreComponents:
+        jd_years = self.store.experience_needed.view()[start:stop]
+        return ScoreComponents(
+            semantic=np.zeros(stop - start, dtype=np.float32),
+            skill=np.zeros(stop - start, dtype=np.float32),
+            experience=batch_experience_similarity(self.cv_data.experience_years, jd_years).astype(np.float32)
+        )
+
+    def _cv_scorer(self) -> CVScorer:
+        if self._scorer is None:
+            self._scorer = CVScorer(self.cv_data)
+        return self._scorer
+
+    def evaluate(self, ids: Iterable[int]) -> int:
+        if not self.lazy:
+            return 0
+        ids = np.fromiter(ids, dtype=np.int64)
+        pending = np.unique(ids[~self.evaluated[ids]])
+        if len(pending) == 0:
+            return 0
+
+        semantic, skill = self._cv_scorer().score(self.store.requirements(pending), self.store.skill_lists(pending))
+        self.components.semantic[pending] = semantic
+        self.components.skill[pending] = skill
+        self.evaluated[pending] = True
+        self.scores[pending] = ScoreComponents(
+            semantic=semantic, skill=skill, experience=self.components.experience[pending]
+        ).combine(self.weights)
+        if self.store.removed_count:
+            self.scores[pending[self.store.removed.view()[pending]]] = -np.inf
+        return len(pending)
+
+    def evaluation_stats(self) -> Dict[str, float]:
+        total = self.size()
+        evaluated = int((self.evaluated & ~self.store.removed.view()).sum()) if self.lazy else total
+        return {
+            "evaluated": evaluated,
+            "total": total,
+            "fraction": evaluated / total if total else 0.0,
+            "encoder_calls": self._scorer.encoder_calls if self._scorer is not None else 0,
+        }
+
+    def reweight(
+        self,
+        semantic: Optional[float] = None,
+        skill: Optional[float] = None,
+        experience: Optional[float] = None
+    ) -> None:
+        self.weights = ScoreWeights(
+            semantic=self.weights.semantic if semantic is None else semantic,
+            skill=self.weights.skill if skill is None else skill,
+            experience=self.weights.experience if experience is None else experience
+        )
+        self.components.combine(self.weights, out=self.scores)
+        self._mask_unscored()
+
+    def set_experience_curve(self, curve: ExperienceCurve) -> None:
+        jd_years = self.store.experience_needed.view().astype(np.float64)
+        experience = np.asarray(curve(self.cv_data.experience_years, jd_years), dtype=self.components.experience.dtype)
+        # Replace rather than write through: the components may be a view over a shared score matrix.
+        self.components = ScoreComponents(
+            semantic=self.components.semantic,
+            skill=self.components.skill,
+            experience=experience
+        )
+        self.components.combine(self.weights, out=self.scores)
+        self._mask_unscored()
+
+    def _mask_unscored(self) -> None:
+        if self.store.removed_count:
+            self.scores[self.store.removed.view()] = -np.inf
+        if self.lazy:
+            self.scores[~self.evaluated] = -np.inf
+
+    def _invalidate(self) -> None:
+        self._alive = None
+
+    def _own_store(self) -> None:
+        if self._shared_store:
+            self.store = self.store.copy()
+            self.neighbor_index = self.neighbor_index.copy()
+            self._shared_store = False
+
+    def add_jobs(self, jobs: Iterable[Job]) -> List[int]:
+        # Dedupes by link within the batch and against the space; jobs without a link are all kept.
+        seen: Set[str] = set()
+        new_jobs = []
+        for job in jobs:
+            if has_link(job):
+                if job.link in seen or self.store.id_of(job) is not None:
+                    continue
+                seen.add(job.link)
+            new_jobs.append(job)
+        if not new_jobs:
+            return []
+
+        self._own_store()
+        ids = self.store.extend(new_jobs)
+        new_components = self._unscored_components(ids[0], ids[-1] + 1)
+        if self.lazy:
+            self.evaluated = np.concatenate((self.evaluated, np.zeros(len(ids), dtype=bool)))
+        else:
+            # Reuses the CV embedding across calls, so streaming small batches in stays cheap.
+            new_components.semantic[:], new_components.skill[:] = self._cv_scorer().score(
+                [job.requirements for job in new_jobs], [job.skills for job in new_jobs]
+            )
+        self.neighbor_index.add_many([job.skills for job in new_jobs], [job.categories for job in new_jobs])
+
+        self.components = ScoreComponents(
+            semantic=np.concatenate((self.components.semantic, new_components.semantic)),
+            skill=np.concatenate((self.components.skill, new_components.skill)),
+            experience=np.concatenate((self.components.experience, new_components.experience))
+        )
+        self.scores = np.concatenate((self.scores, new_components.combine(self.weights)))
+        self._mask_unscored()
+        self._invalidate()
+        return ids
+
+    def remove_jobs(self, jobs: Iterable[Job]) -> int:
+        removed = 0
+        for job in jobs:
+            job_id = self.store.id_of(job)
+            if job_id is None:
+                continue
+            self._own_store()
+            self.store.remove(job_id)
+            self.neighbor_index.remove(job_id)
+            self.scores[job_id] = -np.inf
+            removed += 1
+
+        if removed:
+            self._invalidate()
+        return removed
+
+    def update_job(self, job: Job) -> int:
+        self.remove_jobs([job])
+        return self.add_jobs([job])[0]
+
+    def alive_ids(self) -> np.ndarray:
+        if self._alive is None:
+            self._alive = self.store.alive_ids()
+        return self._alive
+
+    def score(self, job_id: int) -> float:
+        if self.lazy and not self.evaluated[job_id]:
+            self.evaluate([job_id])
+        return float(self.scores[job_id])
+
+    def random_id(self) -> int:
+        if not self.store.removed_count:
+            return random.randrange(self.size())
+        return int(random.choice(self.alive_ids()))
+
+    def sample_ids(self, k: int) -> List[int]:
+        if not self.store.removed_count:
+            return random.sample(range(self.size()), min(k, self.size()))
+        return [int(i) for i in random.sample(list(self.alive_ids()), min(k, self.size()))]
+
+    def neighbor_ids(self, job_id: int, k: int = 5) -> np.ndarray:
+        return self.neighbor_index.neighbors(job_id, k)
+
+    def neighbor_ids_many(self, job_ids: Sequence[int], k: int = 5) -> np.ndarray:
+        return self.neighbor_index.neighbors_many(job_ids, k)
+
+    def top_ids(self, k: int = 3) -> np.ndarray:
+        # Lazily built spaces rank only the jobs evaluated so far.
+        available = int((self.evaluated & ~self.store.removed.view()).sum()) if self.lazy else self.size()
+        k = min(k, available)
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        if k < len(self.scores):
+            candidates = np.argpartition(-self.scores, k - 1)[:k]
+            # Include every id tied with the k-th score so the stable order matches a full sort.
+            threshold = self.scores[candidates].min()
+            candidates = np.flatnonzero(self.scores >= threshold)
+        else:
+            candidates = np.arange(len(self.scores))
+        return candidates[np.argsort(-self.scores[candidates], kind="stable")][:k]
+
+    def materialize(self, ids: Sequence[int]) -> List[Job]:
+        return self.store.materialize_many(ids)
+
+    @property
+    def jobs(self) -> List[Job]:
+        return self.store.materialize_many(self.alive_ids())
+
     def get_score(self, job: Job) -> float:
-        return self._scores.get(id(job), 0.0)
-    
+        job_id = self.store.id_of(job)
+        return self.score(job_id) if job_id is not None else 0.0
+
     def get_random_job(self) -> Job:
-        return random.choice(self.jobs)
-    
+        return self.store.materialize(self.random_id())
+
     def get_neighbors(self, current: Job, k: int = 5) -> List[Job]:
-        current_skills = set(s.lower() for s in current.skills)
-        current_categories = set(c.lower() for c in current.categories)
-        
-        neighbor_scores = []
-        
-        for job in self.jobs:
-            if id(job) == id(current):
-                continue
-            
-            job_skills = set(s.lower() for s in job.skills)
-            job_categories = set(c.lower() for c in job.categories)
-            
-            skill_overlap = len(current_skills & job_skills)
-            category_overlap = len(current_categories & job_categories)
-            
-            neighbor_score = skill_overlap * 2 + category_overlap
-            neighbor_scores.append((job, neighbor_score))
-        
-        neighbor_scores.sort(key=lambda x: x[1], reverse=True)
-        return [job for job, _ in neighbor_scores[:k]]
-    
+        job_id = self.store.id_of(current)
+        if job_id is None:
+            neighbors = self.neighbor_index.query(current.skills, current.categories, k)
+        else:
+            neighbors = self.neighbor_ids(job_id, k)
+        return self.materialize(neighbors)
+
     def get_top_jobs(self, k: int = 3) -> List[Job]:
-        sorted_jobs = sorted(self.jobs, key=lambda j: self.get_score(j), reverse=True)
-        return sorted_jobs[:k]
-    
+        return self.materialize(self.top_ids(k))
+
     def size(self) -> int:
-        return len(self.jobs)
+        return self.store.alive_count()
@@ -1,52 +1,362 @@
-from sentence_transformers import SentenceTransformer, util
-from typing import List
+import os
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 from cv_extraction import CVData
+from embedding_cache import EmbeddingCache, normalize_text
 from job import Job
+from job_store import JobStore
+from skill_vocab import SkillVocabulary, mean_over_lists
+from startup import mark, timed
 
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
+MODEL_NAME = 'all-MiniLM-L6-v2'
+MODEL_DIR = os.environ.get("JOB_RECOMMENDER_MODEL_DIR")
+OFFLINE = os.environ.get("JOB_RECOMMENDER_OFFLINE", "0") == "1"
 
+SEMANTIC_WEIGHT = 0.40
+SKILL_WEIGHT = 0.40
+EXPERIENCE_WEIGHT = 0.20
 
-def calculate_similarity(cv_data: CVData, job: Job) -> float:
-    semantic_score = semantic_similarity(cv_data.raw_text, job.requirements)
-    skill_score = skill_similarity(cv_data.skills, job.skills)
-    exp_score = experience_similarity(cv_data.experience_years, job.experience_needed)
-    
-    final_score = (
-        0.40 * semantic_score +
-        0.40 * skill_score +
-        0.20 * exp_score
-    ) * 100
-    
-    return final_score
+ENCODE_BATCH_SIZE = 256
+SCORE_BLOCK_SIZE = 4096
 
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_enabled = True
+_skill_vocabulary: Optional[SkillVocabulary] = None
 
-def semantic_similarity(text1: str, text2: str) -> float:
-    embeddings = model.encode(
-        [text1, text2], 
-        convert_to_tensor=True,
+_model = None
+_model_lock = threading.Lock()
+# Guards the embedding cache and skill vocabulary singletons. Never held while the model loads.
+_singleton_lock = threading.Lock()
+_warm_up_thread: Optional[threading.Thread] = None
+
+
+@dataclass(frozen=True)
+class ScoreWeights:
+    semantic: float = SEMANTIC_WEIGHT
+    skill: float = SKILL_WEIGHT
+    experience: float = EXPERIENCE_WEIGHT
+
+
+DEFAULT_WEIGHTS = ScoreWeights()
+
+
+@dataclass
+class ScoreComponents:
+    semantic: np.ndarray
+    skill: np.ndarray
+    experience: np.ndarray
+
+    def combine(self, weights: ScoreWeights = DEFAULT_WEIGHTS, out: Optional[np.ndarray] = None) -> np.ndarray:
+        return combine_components(self.semantic, self.skill, self.experience, weights, out)
+
+
+@dataclass
+class ScoreMatrix:
+    semantic: np.ndarray
+    skill: np.ndarray
+    experience: np.ndarray
+
+    @property
+    def shape(self):
+        return self.semantic.shape
+
+    def row(self, i: int) -> ScoreComponents:
+        return ScoreComponents(semantic=self.semantic[i], skill=self.skill[i], experience=self.experience[i])
+
+    def combine(self, weights: ScoreWeights = DEFAULT_WEIGHTS, out: Optional[np.ndarray] = None) -> np.ndarray:
+        return combine_components(self.semantic, self.skill, self.experience, weights, out)
+
+
+def combine_components(
+    semantic: np.ndarray,
+    skill: np.ndarray,
+    experience: np.ndarray,
+    weights: ScoreWeights = DEFAULT_WEIGHTS,
+    out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    if out is None:
+        out = np.empty(np.shape(semantic), dtype=np.result_type(semantic, skill, experience))
+    np.multiply(semantic, weights.semantic * 100, out=out)
+    out += skill * (weights.skill * 100)
+    out += experience * (weights.experience * 100)
+    return out
+
+
+def configure_model(model_dir: Optional[str] = None, offline: bool = False) -> None:
+    # The embedding cache and skill vocabulary hold the old model's vectors, so they go with it.
+    global MODEL_DIR, OFFLINE, _model, _embedding_cache, _skill_vocabulary
+    with _model_lock, _singleton_lock:
+        MODEL_DIR = model_dir
+        OFFLINE = offline
+        _model = None
+        _embedding_cache = None
+        _skill_vocabulary = None
+
+
+def get_model():
+    global _model
+    if _model is not None:
+        return _model
+
+    with _model_lock:
+        if _model is None:
+            if OFFLINE:
+                os.environ["HF_HUB_OFFLINE"] = "1"
+                os.environ["TRANSFORMERS_OFFLINE"] = "1"
+                if MODEL_DIR is None or not os.path.isdir(MODEL_DIR):
+                    raise RuntimeError(
+                        "Offline mode requires JOB_RECOMMENDER_MODEL_DIR to point to a local model directory."
+                    )
+
+            with timed("import sentence_transformers"):
+                from sentence_transformers import SentenceTransformer
+
+            with timed("load embedding model"):
+                _model = SentenceTransformer(MODEL_DIR or MODEL_NAME, local_files_only=OFFLINE)
+    return _model
+
+
+def __getattr__(name: str):
+    if name == "model":
+        return get_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def model_id() -> str:
+    # The full path: two local models in same-named directories must not share cache entries.
+    return os.path.normcase(os.path.abspath(MODEL_DIR)) if MODEL_DIR else MODEL_NAME
+
+
+def embedding_dim() -> int:
+    return get_model().get_sentence_embedding_dimension()
+
+
+def warm_up() -> threading.Thread:
+    global _warm_up_thread
+
+    def run():
+        try:
+            encode_texts(["warm up"])
+            mark("model ready")
+        except Exception as e:
+            print(f"Model warm-up failed: {e}")
+
+    if _warm_up_thread is None or not _warm_up_thread.is_alive():
+        _warm_up_thread = threading.Thread(target=run, name="model-warm-up", daemon=True)
+        _warm_up_thread.start()
+    return _warm_up_thread
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    global _embedding_cache
+    if _embedding_cache is None and _embedding_cache_enabled:
+        # Load the model first, outside the lock; the warm-up thread and the first scorer may both get here.
+        dim = embedding_dim()
+        with _singleton_lock:
+            if _embedding_cache is None and _embedding_cache_enabled:
+                _embedding_cache = EmbeddingCache(model_id(), dim)
+    return _embedding_cache
+
+
+def set_embedding_cache(cache: Optional[EmbeddingCache]) -> None:
+    global _embedding_cache, _embedding_cache_enabled
+    with _singleton_lock:
+        _embedding_cache = cache
+        _embedding_cache_enabled = cache is not None
+
+
+def encode_texts(texts: Sequence[str], batch_size: int = ENCODE_BATCH_SIZE) -> np.ndarray:
+    if not texts:
+        return np.zeros((0, embedding_dim()), dtype=np.float32)
+
+    texts = [normalize_text(text) for text in texts]
+    cache = get_embedding_cache()
+    if cache is None:
+        return _encode_uncached(texts, batch_size)
+
+    embeddings, missing = cache.lookup(texts)
+    if missing:
+        unique_missing = list(dict.fromkeys(texts[i] for i in missing))
+        encoded = _encode_uncached(unique_missing, batch_size)
+        cache.store(unique_missing, encoded)
+        rows = {text: row for row, text in enumerate(unique_missing)}
+        embeddings[missing] = encoded[[rows[texts[i]] for i in missing]]
+    return embeddings
+
+
+def _encode_uncached(texts: List[str], batch_size: int) -> np.ndarray:
+    embeddings = get_model().encode(
+        texts,
+        batch_size=batch_size,
+        convert_to_numpy=True,
         normalize_embeddings=True,
         show_progress_bar=False
     )
-    similarity = util.cos_sim(embeddings[0], embeddings[1])
-    return float(similarity.item())
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def _job_columns(jobs: Union[Sequence[Job], JobStore]) -> Tuple[List[str], List[List[str]], np.ndarray]:
+    if isinstance(jobs, JobStore):
+        return jobs.requirements(), jobs.skill_lists(), jobs.experience_needed.view()
+    return (
+        [job.requirements for job in jobs],
+        [job.skills for job in jobs],
+        np.array([job.experience_needed for job in jobs], dtype=np.float64)
+    )
+
+
+def batch_score_matrix(
+    cvs: Sequence[CVData],
+    jobs: Union[Sequence[Job], JobStore],
+    block_size: int = SCORE_BLOCK_SIZE,
+    batch_size: int = ENCODE_BATCH_SIZE,
+    vocabulary: Optional[SkillVocabulary] = None
+) -> ScoreMatrix:
+    n_cvs, n_jobs = len(cvs), len(jobs)
+    semantic = np.zeros((n_cvs, n_jobs), dtype=np.float32)
+    skill = np.zeros((n_cvs, n_jobs), dtype=np.float32)
+    experience = np.zeros((n_cvs, n_jobs), dtype=np.float32)
+    if n_cvs == 0 or n_jobs == 0:
+        return ScoreMatrix(semantic=semantic, skill=skill, experience=experience)
+
+    requirements, skill_lists, jd_years = _job_columns(jobs)
+    cv_embeddings = encode_texts([cv.raw_text for cv in cvs], batch_size)
+
+    # Job-side work happens once per block and is shared by every CV.
+    for start in range(0, n_jobs, block_size):
+        block = requirements[start:start + block_size]
+        requirement_embeddings = encode_texts(block, batch_size)
+        semantic[:, start:start + len(block)] = cv_embeddings @ requirement_embeddings.T
+
+    vocabulary = vocabulary or get_skill_vocabulary()
+    cv_skill_indices = [vocabulary.encode(cv.skills) for cv in cvs]
+    flat_indices, lengths = vocabulary.encode_lists(skill_lists)
+    vocabulary.embed_pending(lambda skills: encode_texts(skills, batch_size))
+
+    for i, cv in enumerate(cvs):
+        if len(cv_skill_indices[i]):
+            skill[i] = mean_over_lists(vocabulary.cv_similarity(cv_skill_indices[i]), flat_indices, lengths)
+        experience[i] = batch_experience_similarity(cv.experience_years, jd_years)
+
+    return ScoreMatrix(semantic=semantic, skill=skill, experience=experience)
+
+
+def batch_score_components(
+    cv_data: CVData,
+    jobs: Union[Sequence[Job], JobStore],
+    batch_size: int = ENCODE_BATCH_SIZE
+) -> ScoreComponents:
+    return batch_score_matrix([cv_data], jobs, batch_size=batch_size).row(0)
+
+
+class CVScorer:
+    """Scores arbitrary batches of jobs against one CV.
+
+    The CV embedding and skill indices are computed once; each ``score`` call
+    encodes the batch's requirements together with any skills the vocabulary
+    has not embedded yet, in a single ``encode_texts`` call.
+    """
+
+    def __init__(
+        self,
+        cv_data: CVData,
+        batch_size: int = ENCODE_BATCH_SIZE,
+        vocabulary: Optional[SkillVocabulary] = None
+    ):
+        self.cv_data = cv_data
+        self.batch_size = batch_size
+        self.vocabulary = vocabulary or get_skill_vocabulary()
+        self.cv_embedding = encode_texts([cv_data.raw_text], batch_size)[0]
+        self.cv_skill_indices = self.vocabulary.encode(cv_data.skills)
+        self.encoder_calls = 0
+
+    def score(self, requirements: Sequence[str], skill_lists: Sequence[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        if not requirements:
+            return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+
+        flat_indices, lengths = self.vocabulary.encode_lists(skill_lists)
+        pending = self.vocabulary.skills[len(self.vocabulary.embeddings):]
+        embeddings = encode_texts(list(requirements) + pending, self.batch_size)
+        self.encoder_calls += 1
+        requirement_embeddings, skill_embeddings = embeddings[:len(requirements)], embeddings[len(requirements):]
+
+        def encode_pending(skills: List[str]) -> np.ndarray:
+            # Another thread may have grown the vocabulary since ``pending`` was read.
+            return skill_embeddings if skills == pending else encode_texts(skills, self.batch_size)
+
+        self.vocabulary.embed_pending(encode_pending)
+        semantic = (requirement_embeddings @ self.cv_embedding).astype(np.float32)
+        skill = np.zeros(len(requirements), dtype=np.float32)
+        if len(self.cv_skill_indices):
+            skill[:] = mean_over_lists(self.vocabulary.cv_similarity(self.cv_skill_indices), flat_indices, lengths)
+        return semantic, skill
+
+
+def batch_calculate_similarity(
+    cv_data: CVData,
+    jobs: Sequence[Job],
+    batch_size: int = ENCODE_BATCH_SIZE
+) -> np.ndarray:
+    return batch_score_components(cv_data, jobs, batch_size).combine()
+
+
+def calculate_similarity(cv_data: CVData, job: Job) -> float:
+    return float(batch_calculate_similarity(cv_data, [job])[0])
+
+
+def semantic_similarity(text1: str, text2: str) -> float:
+    embeddings = encode_texts([text1, text2])
+    return float(embeddings[0] @ embeddings[1])
+
 
 def skill_similarity(cv_skills: List[str], job_skills: List[str]) -> float:
-    if not job_skills or not cv_skills:
-        return 0.0
-    cv_embeddings = model.encode(cv_skills, convert_to_tensor=True, show_progress_bar=False)
-    job_embeddings = model.encode(job_skills, convert_to_tensor=True, show_progress_bar=False)
-    similarity_matrix = util.cos_sim(job_embeddings, cv_embeddings)
-    best_matches = [float(scores.max()) for scores in similarity_matrix]
-    return sum(best_matches) / len(job_skills)
+    return float(batch_skill_similarity(cv_skills, [job_skills])[0])
+
+
+def get_skill_vocabulary() -> SkillVocabulary:
+    global _skill_vocabulary
+    if _skill_vocabulary is None:
+        dim = embedding_dim()
+        with _singleton_lock:
+            if _skill_vocabulary is None:
+                _skill_vocabulary = SkillVocabulary(dim)
+    return _skill_vocabulary
+
+
+def batch_skill_similarity(
+    cv_skills: List[str],
+    job_skill_lists: Sequence[List[str]],
+    batch_size: int = ENCODE_BATCH_SIZE,
+    vocabulary: Optional[SkillVocabulary] = None
+) -> np.ndarray:
+    if not cv_skills:
+        return np.zeros(len(job_skill_lists), dtype=np.float64)
+
+    vocabulary = vocabulary or get_skill_vocabulary()
+    cv_indices = vocabulary.encode(cv_skills)
+    flat_indices, lengths = vocabulary.encode_lists(job_skill_lists)
+    vocabulary.embed_pending(lambda skills: encode_texts(skills, batch_size))
+
+    return mean_over_lists(vocabulary.cv_similarity(cv_indices), flat_indices, lengths)
+
 
 def experience_similarity(cv_years: float, jd_years: int) -> float:
     if jd_years == 0:
         return 1.0
-    
+
     if cv_years >= jd_years:
         return 1.0
     else:
         ratio = cv_years / jd_years
         return ratio ** 0.7
+
+
+def batch_experience_similarity(cv_years: float, jd_years: Sequence[int]) -> np.ndarray:
+    jd = np.asarray(jd_years, dtype=np.float64)
+    ratio = np.divide(cv_years, jd, out=np.ones_like(jd), where=jd != 0)
+    return np.where(ratio >= 1.0, 1.0, np.power(np.clip(ratio, 0.0, None), 0.7))
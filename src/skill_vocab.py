@@ -0,0 +1,74 @@
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+def normalize_skill(skill: str) -> str:
+    return " ".join(str(skill).lower().split())
+
+
+class SkillVocabulary:
+    """Interns normalized skill strings and keeps one embedding row per skill.
+
+    Skill lists become int32 index arrays into ``embeddings``, so scoring a
+    corpus is a gather over a CV-vs-vocabulary similarity vector.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.index: Dict[str, int] = {}
+        self.skills: List[str] = []
+        self.embeddings = np.zeros((0, dim), dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def intern(self, skill: str) -> int:
+        key = normalize_skill(skill)
+        idx = self.index.get(key)
+        if idx is None:
+            with self._lock:
+                idx = self.index.get(key)
+                if idx is None:
+                    idx = len(self.skills)
+                    self.index[key] = idx
+                    self.skills.append(key)
+        return idx
+
+    def encode(self, skills: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self.intern(skill) for skill in skills), dtype=np.int32, count=len(skills))
+
+    def encode_lists(self, skill_lists: Sequence[Sequence[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        lengths = np.fromiter((len(skills) for skills in skill_lists), dtype=np.int64, count=len(skill_lists))
+        flat = self.encode([skill for skills in skill_lists for skill in skills])
+        return flat, lengths
+
+    def embed_pending(self, encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        with self._lock:
+            start = self.embeddings.shape[0]
+            if start < len(self.skills):
+                pending = self.skills[start:]
+                self.embeddings = np.concatenate(
+                    (self.embeddings, np.asarray(encode(pending), dtype=np.float32).reshape(-1, self.dim))
+                )
+            return self.embeddings
+
+    def cv_similarity(self, cv_indices: np.ndarray) -> np.ndarray:
+        if len(cv_indices) == 0:
+            return np.zeros(len(self.embeddings), dtype=np.float64)
+        cv_embeddings = self.embeddings[np.unique(cv_indices)]
+        return (self.embeddings @ cv_embeddings.T).max(axis=1).astype(np.float64)
+
+
+def mean_over_lists(values: np.ndarray, flat_indices: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    scores = np.zeros(len(lengths), dtype=np.float64)
+    if len(flat_indices) == 0:
+        return scores
+
+    gathered = values[flat_indices]
+    has_items = lengths > 0
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    scores[has_items] = np.add.reduceat(gathered, offsets[has_items]) / lengths[has_items]
+    return scores
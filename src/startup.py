@@ -0,0 +1,39 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+
+_START = time.perf_counter()
+_events: List[Tuple[str, float, float]] = []
+_lock = threading.Lock()
+
+
+def elapsed() -> float:
+    return time.perf_counter() - _START
+
+
+def mark(name: str) -> None:
+    with _lock:
+        _events.append((name, elapsed(), 0.0))
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    begin = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        with _lock:
+            _events.append((name, end - _START, end - begin))
+
+
+def startup_report() -> str:
+    with _lock:
+        events = sorted(_events, key=lambda e: e[1])
+
+    lines = [f"{'event':<32}{'at (s)':>10}{'took (s)':>10}"]
+    for name, at, took in events:
+        lines.append(f"{name:<32}{at:>10.3f}{(f'{took:.3f}' if took else '-'):>10}")
+    return "\n".join(lines)
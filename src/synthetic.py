@@ -0,0 +1,71 @@
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from job import Job
+
+
+CITIES = ["Cairo", "Giza", "Alexandria", "Mansoura", "Tanta", "Ismailia", "Suez", "Aswan"]
+JOB_TYPES = ["Full Time", "Part Time", "Internship", "Freelance / Project"]
+WORK_PLACES = ["On-site", "Remote", "Hybrid"]
+CAREER_LEVELS = ["Entry Level", "Experienced", "Manager", "Senior Management", "Student"]
+EDUCATION_LEVELS = ["Bachelor's Degree", "Master's Degree", "Not Specified"]
+TITLE_LEVELS = ["Junior", "Mid-Level", "Senior", "Lead", "Principal"]
+TITLE_ROLES = [
+    "Data Engineer", "Backend Developer", "Frontend Developer", "ML Engineer", "Data Analyst",
+    "DevOps Engineer", "QA Engineer", "Product Manager", "Accountant", "Sales Representative"
+]
+
+
+def zipf_weights(n: int, exponent: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def synthetic_jobs(
+    n: int,
+    n_skills: int = 500,
+    n_categories: int = 30,
+    n_companies: int = 2000,
+    skills_per_job: Tuple[int, int] = (3, 10),
+    categories_per_job: Tuple[int, int] = (1, 3),
+    skill_exponent: float = 1.1,
+    category_exponent: float = 0.8,
+    seed: int = 0
+) -> Iterator[Job]:
+    rng = np.random.default_rng(seed)
+    skills = [f"skill {i}" for i in range(n_skills)]
+    categories = [f"category {i}" for i in range(n_categories)]
+    companies = [f"company {i}" for i in range(n_companies)]
+    skill_p = zipf_weights(n_skills, skill_exponent)
+    category_p = zipf_weights(n_categories, category_exponent)
+
+    skill_counts = rng.integers(skills_per_job[0], skills_per_job[1] + 1, size=n)
+    category_counts = rng.integers(categories_per_job[0], categories_per_job[1] + 1, size=n)
+    # Draws are with replacement and deduplicated per job, so counts are upper bounds.
+    skill_draws = np.split(rng.choice(n_skills, size=int(skill_counts.sum()), p=skill_p), np.cumsum(skill_counts)[:-1])
+    category_draws = np.split(
+        rng.choice(n_categories, size=int(category_counts.sum()), p=category_p), np.cumsum(category_counts)[:-1]
+    )
+
+    for i in range(n):
+        job_skills: List[str] = [skills[s] for s in dict.fromkeys(skill_draws[i].tolist())]
+        job_categories = [categories[c] for c in dict.fromkeys(category_draws[i].tolist())]
+        yield Job(
+            job_search="synthetic",
+            title=f"{TITLE_LEVELS[rng.integers(len(TITLE_LEVELS))]} {TITLE_ROLES[rng.integers(len(TITLE_ROLES))]}",
+            company=companies[rng.integers(n_companies)],
+            country="Egypt",
+            city=CITIES[rng.integers(len(CITIES))],
+            area="N/A",
+            link=f"https://example.invalid/jobs/{i}",
+            job_type=JOB_TYPES[rng.integers(len(JOB_TYPES))],
+            work_place=WORK_PLACES[rng.integers(len(WORK_PLACES))],
+            salary=int(rng.integers(5, 80)) * 1000 if rng.random() < 0.3 else "N/A",
+            experience_needed=int(rng.integers(0, 11)),
+            career_level=CAREER_LEVELS[rng.integers(len(CAREER_LEVELS))],
+            education_level=EDUCATION_LEVELS[rng.integers(len(EDUCATION_LEVELS))],
+            categories=job_categories,
+            skills=job_skills,
+            requirements=f"Listing {i} requires " + ", ".join(job_skills)
+        )
@@ -1,152 +1,420 @@
-import requests
-from bs4 import BeautifulSoup
-import urllib.parse
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import WebDriverException
-import time
-from typing import List
-
-from job import Job, parse_experience, parse_salary, parse_list
-
-
-def create_chrome_driver(timeout: int = 30) -> webdriver.Chrome:
-    chrome_options = Options()
-
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-
-    try:
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.set_page_load_timeout(timeout)
-        return driver
-    except WebDriverException as e:
-        raise RuntimeError(
-            "Failed to start Chrome WebDriver."
-        ) from e
-
-
-def scrape_job_listings(job_name: str, page_limit: int = 1) -> List[Job]:
-    jobs = []
-
-    if page_limit <= 0:
-        return jobs
-
-    for page in range(0, page_limit):
-        parsed_job = urllib.parse.quote(job_name)
-        url = f'https://wuzzuf.net/search/jobs/?a=navbg%7Cspbg&filters%5Bcountry%5D%5B0%5D=Egypt&q={parsed_job}&start={page}'
-
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-        except requests.RequestException as e:
-            raise RuntimeError(f"Request error while fetching {url}") from e
-
-        try:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            job_cards = soup.find_all('div', class_='css-ghe2tq e1v1l3u10')
-        except Exception as e:
-            raise RuntimeError(f"Parsing error while parsing response from {url}") from e
-
-        if not job_cards:
-            break
-
-        for card in job_cards:
-            try:
-                job = Job(job_search=job_name)
-
-                title_elem = card.find("h2", class_="css-193uk2c")
-                job.title = title_elem.text.strip() if title_elem else "N/A"
-
-                company_elem = card.find("a", class_="css-ipsyv7")
-                job.company = company_elem.text.strip().rstrip(" -") if company_elem else "N/A"
-
-                location_elem = card.find("span", class_="css-16x61xq")
-                if location_elem:
-                    loc_parts = location_elem.text.split(',')
-                    job.country = loc_parts[-1].strip() if len(loc_parts) > 0 else "N/A"
-                    job.city = loc_parts[0].strip() if len(loc_parts) > 0 else "N/A"
-                    job.area = loc_parts[1].strip() if len(loc_parts) > 1 else "N/A"
-
-                link_elem = card.find("a", class_="css-o171kl")
-                job.link = link_elem.get('href') if link_elem else "N/A"
-
-                type_elem = card.find("span", class_="css-uc9rga eoyjyou0")
-                job.job_type = type_elem.text.strip() if type_elem else "N/A"
-
-                workplace_elem = card.select_one("span[class*='css-uofntu eoyjyou0']")
-                job.work_place = workplace_elem.get_text(strip=True) if workplace_elem else "N/A"
-
-                jobs.append(job)
-            except Exception as e:
-                print(f"Error processing job card: {e}")
-                continue
-
-    return jobs
-
-
-def scrape_job_details(jobs: List[Job]) -> List[Job]:
-    with open("utils/job_details_extractor.js", "r", encoding="utf-8") as f:
-        extract_script = f.read() + "\nreturn extractJobDetails();"
-
-    if not jobs:
-        return jobs
-
-    driver = None
-    created_driver = False
-
-    try:
-        try:
-            driver = create_chrome_driver()
-            created_driver = True
-        except RuntimeError as e:
-            raise RuntimeError("Chrome WebDriver error while creating driver.") from e
-
-        for job in jobs:
-            if not job.link or job.link == 'N/A':
-                continue
-
-            try:
-                driver.get(job.link)
-                time.sleep(2)
-
-                data = driver.execute_script(extract_script)
-
-                if not isinstance(data, dict):
-                    print(f"Unexpected data format for {job.link}")
-                    continue
-
-                job.experience_needed = parse_experience(data.get('experience', 'N/A'))
-                job.career_level = data.get('careerLevel', 'N/A')
-                job.education_level = data.get('education', 'N/A')
-                job.salary = parse_salary(data.get('salary', 'N/A'))
-                job.categories = parse_list(data.get('categories', 'N/A'))
-                job.skills = parse_list(data.get('skills', 'N/A'))
-                job.requirements = data.get('requirements', 'N/A')
-            except Exception as e:
-                print(f"Error extracting details for {job.link}: {e}")
-                continue
-
-        return jobs
-    finally:
-        if created_driver and driver is not None:
-            try:
-                driver.quit()
-            except Exception:
-                pass
-
-
-def scrape_jobs(job_name: str, page_limit: int = 1) -> List[Job]:
-    try:
-        jobs = scrape_job_listings(job_name.strip(), page_limit)
-    except Exception as e:
-        raise RuntimeError(f"Failed to scrape listings for '{job_name}'.") from e
-
-    try:
-        jobs = scrape_job_details(jobs)
-    except Exception as e:
-        raise RuntimeError(f"Failed to scrape job details for listings of '{job_name}'.") from e
-
-    return jobs
\ No newline at end of file
+import requests
+import urllib.parse
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from driver_pool import DEFAULT_WORKERS, PAGES_PER_DRIVER, DriverPool
+from fetch_control import FetchController, get_fetch_controller
+from http_fetch import cache_only, create_session
+from job import Job, parse_experience, parse_salary, parse_list
+from job_db import JobDatabase, query_key
+from job_details_parser import parse_job_details
+from listing_parser import parse_listing_page
+
+
+def create_chrome_driver(timeout: int = 30) -> webdriver.Chrome:
+    chrome_options = Options()
+
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+
+    try:
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.set_page_load_timeout(timeout)
+        return driver
+    except WebDriverException as e:
+        raise RuntimeError(
+            "Failed to start Chrome WebDriver."
+        ) from e
+
+
+def listing_url(job_name: str, page: int) -> str:
+    parsed_job = urllib.parse.quote(job_name)
+    return f'https://wuzzuf.net/search/jobs/?a=navbg%7Cspbg&filters%5Bcountry%5D%5B0%5D=Egypt&q={parsed_job}&start={page}'
+
+
+def scrape_job_listings(
+    job_name: str,
+    page_limit: int = 1,
+    session: Optional[requests.Session] = None,
+    max_workers: Optional[int] = None,
+    stop_when: Optional[Callable[[List[Job]], bool]] = None,
+    controller: Optional[FetchController] = None
+) -> List[Job]:
+    if page_limit <= 0:
+        return []
+
+    controller = controller or get_fetch_controller()
+    max_workers = max_workers or controller.max_concurrency
+    own_session = session is None
+    session = session or create_session(pool_size=max_workers, retries=0)
+
+    def load(page: int) -> List[Job]:
+        url = listing_url(job_name, page)
+        return parse_listing_page(controller.fetch(session, url), job_name, url)
+
+    # Pages complete out of order within a bounded window; the controller decides how many
+    # are actually in flight. The first empty page ends the listing and a page matching
+    # ``stop_when`` is kept but is the last one. With ``stop_when``, page 0 is fetched on
+    # its own first, so a fully known listing costs one request, and pages past a stop
+    # that have not started yet are cancelled. A page that still fails after the
+    # controller's retries is skipped; the run only fails if no page could be read.
+    pages: Dict[int, List[Job]] = {}
+    errors: Dict[int, RuntimeError] = {}
+    last_page = page_limit
+    next_page = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = {}
+            while True:
+                window = 1 if stop_when is not None and not pages and not errors else max_workers
+                while next_page < last_page and len(in_flight) < window:
+                    in_flight[executor.submit(load, next_page)] = next_page
+                    next_page += 1
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = in_flight.pop(future)
+                    try:
+                        page_jobs = future.result()
+                    except RuntimeError as e:
+                        errors[page] = e
+                        continue
+                    if page_jobs:
+                        pages[page] = page_jobs
+                        if stop_when is not None and stop_when(page_jobs):
+                            last_page = min(last_page, page + 1)
+                    else:
+                        last_page = min(last_page, page)
+                for future in [f for f, page in in_flight.items() if page >= last_page]:
+                    if future.cancel():
+                        del in_flight[future]
+    finally:
+        if own_session:
+            session.close()
+
+    failed = sorted(page for page in errors if page < last_page)
+    if failed and not any(page < last_page for page in pages):
+        raise errors[failed[0]]
+    for page in failed:
+        print(f"Skipping listing page {page} of '{job_name}': {errors[page]}")
+    return [job for page in sorted(pages) if page < last_page for job in pages[page]]
+
+
+def load_extract_script() -> str:
+    with open("utils/job_details_extractor.js", "r", encoding="utf-8") as f:
+        return f.read() + "\nreturn extractJobDetails();"
+
+
+def apply_job_details(job: Job, data: Dict[str, str]) -> None:
+    job.experience_needed = parse_experience(data.get('experience', 'N/A'))
+    job.career_level = data.get('careerLevel', 'N/A')
+    job.education_level = data.get('education', 'N/A')
+    job.salary = parse_salary(data.get('salary', 'N/A'))
+    job.categories = parse_list(data.get('categories', 'N/A'))
+    job.skills = parse_list(data.get('skills', 'N/A'))
+    job.requirements = data.get('requirements', 'N/A')
+
+
+def iter_job_details_http(
+    jobs: List[Job],
+    session: Optional[requests.Session] = None,
+    max_workers: Optional[int] = None,
+    controller: Optional[FetchController] = None
+) -> Iterator[Tuple[Job, bool]]:
+    # Yields (job, parsed) as each server-rendered page comes back, filling in details as it goes.
+    if not jobs:
+        return
+
+    controller = controller or get_fetch_controller()
+    max_workers = max_workers or controller.max_concurrency
+    own_session = session is None
+    session = session or create_session(pool_size=max_workers, retries=0)
+
+    def load(job: Job) -> Optional[Dict[str, str]]:
+        try:
+            return parse_job_details(controller.fetch(session, job.link))
+        except RuntimeError as e:
+            print(f"Error fetching details for {job.link}: {e}")
+            return None
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(load, job): job for job in jobs}
+        for future in as_completed(futures):
+            job, data = futures[future], future.result()
+            if data is not None:
+                apply_job_details(job, data)
+            yield job, data is not None
+    finally:
+        executor.shutdown(cancel_futures=True)
+        if own_session:
+            session.close()
+
+
+def scrape_job_details_http(
+    jobs: List[Job],
+    session: Optional[requests.Session] = None,
+    max_workers: Optional[int] = None,
+    controller: Optional[FetchController] = None
+) -> List[Job]:
+    # Fills in details from the server-rendered pages and returns the jobs that could not be parsed.
+    parsed = {job.link for job, ok in iter_job_details_http(jobs, session, max_workers, controller) if ok}
+    return [job for job in jobs if job.link not in parsed]
+
+
+def scrape_job_details_selenium(
+    jobs: List[Job],
+    workers: int = DEFAULT_WORKERS,
+    pages_per_driver: int = PAGES_PER_DRIVER
+) -> List[Job]:
+    extract_script = load_extract_script()
+
+    targets = [job for job in jobs if job.link and job.link != 'N/A']
+    if not targets:
+        return jobs
+
+    pool = DriverPool(create_chrome_driver, workers=workers, pages_per_driver=pages_per_driver)
+    for job, data in pool.run(targets, extract_script):
+        try:
+            apply_job_details(job, data)
+        except Exception as e:
+            print(f"Error extracting details for {job.link}: {e}")
+
+    return jobs
+
+
+def iter_job_details(
+    jobs: List[Job],
+    session: Optional[requests.Session] = None,
+    max_workers: Optional[int] = None,
+    selenium_fallback: bool = True,
+    selenium_workers: int = DEFAULT_WORKERS,
+    controller: Optional[FetchController] = None
+) -> Iterator[Job]:
+    # Yields every job once, each as soon as its details are final: jobs without a link
+    # first, then HTTP-parsed pages as they arrive, then whatever needed the fallback.
+    targets = [job for job in jobs if job.link and job.link != 'N/A']
+    yield from (job for job in jobs if not job.link or job.link == 'N/A')
+
+    parsed = set()
+    for job, ok in iter_job_details_http(targets, session, max_workers, controller):
+        if ok:
+            parsed.add(job.link)
+            yield job
+    unparsed = [job for job in targets if job.link not in parsed]
+
+    # Only pages the HTTP extractor could not read (e.g. client-rendered) pay for a browser,
+    # and never in cache-only mode.
+    if unparsed and selenium_fallback and not cache_only():
+        try:
+            scrape_job_details_selenium(unparsed, workers=selenium_workers)
+        except RuntimeError as e:
+            print(f"Selenium fallback unavailable for {len(unparsed)} jobs: {e}")
+    yield from unparsed
+
+
+def scrape_job_details(
+    jobs: List[Job],
+    session: Optional[requests.Session] = None,
+    max_workers: Optional[int] = None,
+    selenium_fallback: bool = True,
+    selenium_workers: int = DEFAULT_WORKERS,
+    controller: Optional[FetchController] = None
+) -> List[Job]:
+    for _ in iter_job_details(jobs, session, max_workers, selenium_fallback, selenium_workers, controller):
+        pass
+    return jobs
+
+
+def _listings_with_store(
+    job_name: str,
+    page_limit: int,
+    db: Optional[JobDatabase],
+    session: Optional[requests.Session] = None
+) -> Tuple[List[Job], List[Job]]:
+    # Returns the listed jobs and the subset whose details still have to be scraped.
+    # Once a listing page holds only links this query already found, later pages are
+    # assumed to be known too and are read back from the store instead.
+    stopped_early = False
+
+    def all_known(page_jobs: List[Job]) -> bool:
+        nonlocal stopped_early
+        links = {job.link for job in page_jobs}
+        if db.known_links(links, query=job_name) == links:
+            stopped_early = True
+            return True
+        return False
+
+    try:
+        jobs = scrape_job_listings(
+            job_name, page_limit, session=session, stop_when=all_known if db is not None else None
+        )
+    except Exception as e:
+        raise RuntimeError(f"Failed to scrape listings for '{job_name}'.") from e
+
+    if db is None:
+        return jobs, jobs
+
+    db.save_listings(jobs, query=job_name)
+    if stopped_early:
+        seen = {job.link for job in jobs}
+        # Only jobs listed within the TTL: older rows are likely expired postings whose pages now 404.
+        jobs += [job for job in db.load_jobs(job_name, recent_only=True) if job.link not in seen]
+    return jobs, db.fill_details(jobs)
+
+
+def scrape_jobs(
+    job_name: str,
+    page_limit: int = 1,
+    db: Optional[JobDatabase] = None,
+    offline: bool = False
+) -> List[Job]:
+    job_name = job_name.strip()
+    if offline:
+        if db is None:
+            raise RuntimeError("Offline runs need a job database.")
+        return db.load_jobs(job_name)
+
+    jobs, stale = _listings_with_store(job_name, page_limit, db)
+
+    try:
+        scrape_job_details(stale)
+    except Exception as e:
+        raise RuntimeError(f"Failed to scrape job details for listings of '{job_name}'.") from e
+
+    if db is not None:
+        db.save_details(stale)
+
+    return jobs
+
+
+def iter_scrape_jobs(
+    job_name: str,
+    page_limit: int = 1,
+    db: Optional[JobDatabase] = None,
+    offline: bool = False,
+    on_stage: Optional[Callable[[str], None]] = None
+) -> Iterator[Job]:
+    # Streaming scrape_jobs: stored jobs first, then each scraped job as soon as its details are in.
+    # ``on_stage`` is called with "listings" and then "details" as each stage finishes.
+    def finished(stage: str) -> None:
+        if on_stage is not None:
+            on_stage(stage)
+
+    job_name = job_name.strip()
+    if offline:
+        if db is None:
+            raise RuntimeError("Offline runs need a job database.")
+        jobs = db.load_jobs(job_name)
+        finished("listings")
+        yield from jobs
+        finished("details")
+        return
+
+    jobs, stale = _listings_with_store(job_name, page_limit, db)
+    finished("listings")
+    stale_links = {job.link for job in stale}
+    yield from (job for job in jobs if job.link not in stale_links)
+
+    try:
+        for job in iter_job_details(stale):
+            if db is not None:
+                db.save_details([job])
+            yield job
+    except Exception as e:
+        raise RuntimeError(f"Failed to scrape job details for listings of '{job_name}'.") from e
+    finished("details")
+
+
+def unique_queries(queries: List[str]) -> List[str]:
+    # First spelling of each distinct query, whitespace collapsed; blank queries are dropped.
+    unique: Dict[str, str] = {}
+    for query in queries:
+        query = " ".join(query.split())
+        if query:
+            unique.setdefault(query_key(query), query)
+    return list(unique.values())
+
+
+def merge_query_results(results: List[Tuple[str, List[Job]]]) -> List[Job]:
+    # One Job per link, in first-seen order, with every distinct query it matched in job_search.
+    merged: Dict[str, Job] = {}
+    terms: Dict[str, Dict[str, str]] = {}
+    unlinked = []
+    for query, jobs in results:
+        for job in jobs:
+            if not job.link or job.link == 'N/A':
+                unlinked.append(job)
+                continue
+            merged.setdefault(job.link, job)
+            terms.setdefault(job.link, {}).setdefault(query_key(query), " ".join(query.split()))
+
+    for link, job in merged.items():
+        job.job_search = " | ".join(terms[link].values())
+    return list(merged.values()) + unlinked
+
+
+def scrape_jobs_batch(
+    queries: List[str],
+    page_limit: int = 1,
+    db: Optional[JobDatabase] = None,
+    offline: bool = False,
+    max_workers: int = 4
+) -> List[Job]:
+    queries = unique_queries(queries)
+    if offline:
+        if db is None:
+            raise RuntimeError("Offline runs need a job database.")
+        return merge_query_results([(query, db.load_jobs(query)) for query in queries])
+
+    # All queries' listing pages share one session and the fetch controller, so the
+    # controller's limits apply to the batch as a whole.
+    controller = get_fetch_controller()
+    session = create_session(pool_size=controller.max_concurrency, retries=0)
+    try:
+        results: List[Tuple[str, List[Job]]] = []
+        stale_links = set()
+        errors: Dict[str, RuntimeError] = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_listings_with_store, query, page_limit, db, session): query for query in queries
+            }
+            for future in as_completed(futures):
+                query = futures[future]
+                try:
+                    jobs, stale = future.result()
+                except RuntimeError as e:
+                    errors[query] = e
+                    continue
+                results.append((query, jobs))
+                stale_links.update(job.link for job in stale)
+
+        if errors and not results:
+            raise next(iter(errors.values()))
+        for query, error in errors.items():
+            print(f"Skipping query '{query}': {error}")
+
+        # Deduplicate before any detail page is fetched, then scrape the details once.
+        results.sort(key=lambda item: queries.index(item[0]))
+        jobs = merge_query_results(results)
+        stale = [job for job in jobs if job.link in stale_links]
+        try:
+            scrape_job_details(stale, session=session)
+        except Exception as e:
+            raise RuntimeError(f"Failed to scrape job details for {len(queries)} queries.") from e
+    finally:
+        session.close()
+
+    if db is not None:
+        db.save_labels(jobs)
+        db.save_details(stale)
+    return jobs
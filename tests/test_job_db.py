@@ -0,0 +1,34 @@
+import sqlite3
+
+from job import Job
+from job_db import JobDatabase
+
+
+def _jobs():
+    return [
+        Job(title="ML Engineer", link="https://example.com/jobs/1"),
+        Job(title="Data Scientist", link="https://example.com/jobs/2"),
+    ]
+
+
+def test_query_found_regardless_of_case_and_spacing():
+    with JobDatabase(":memory:") as db:
+        db.save_listings(_jobs(), query="  Machine   Learning ")
+        links = [job.link for job in _jobs()]
+
+        assert db.known_links(links, query="machine learning") == set(links)
+        assert {job.link for job in db.load_jobs("MACHINE LEARNING")} == set(links)
+        assert db.load_jobs("deep learning") == []
+
+
+def test_queries_stored_as_typed_are_normalised_on_open(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    with JobDatabase(path) as db:
+        db.save_listings(_jobs(), query="ml engineer")
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("UPDATE job_searches SET query = 'ML  Engineer' WHERE link LIKE '%/1'")
+    conn.close()
+
+    with JobDatabase(path) as db:
+        assert {job.link for job in db.load_jobs("Ml Engineer")} == {job.link for job in _jobs()}
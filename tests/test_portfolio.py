@@ -0,0 +1,21 @@
+import numpy as np
+
+from bench_search import BENCH_CV, synthetic_components
+from job_store import JobStore
+from portfolio import run_portfolio
+from search_space import JobSearchSpace
+from synthetic import synthetic_jobs
+
+
+def test_in_process_results_keep_ids_of_jobs_without_a_link():
+    jobs = list(synthetic_jobs(300, seed=0))
+    for job in jobs:
+        job.link = "N/A"
+    store = JobStore.from_jobs(jobs)
+    space = JobSearchSpace(store, BENCH_CV, components=synthetic_components(store, BENCH_CV.experience_years))
+
+    result = run_portfolio(space, restarts=4, deadline=30.0)
+
+    assert result.stop_reason != "deadline"
+    assert len(set(result.ids)) == len(result.ids) > 1
+    assert np.allclose(result.scores, space.scores[result.ids])
@@ -0,0 +1,22 @@
+import pytest
+
+from bench_search import build_space
+from search_algorithms import HillClimbing, LocalBeamSearch, SimulatedAnnealing, TabuSearch
+from search_engine import SearchBudget, SearchEngine
+
+
+@pytest.fixture(scope="module")
+def space():
+    return build_space(500)
+
+
+@pytest.mark.parametrize("strategy", [HillClimbing, SimulatedAnnealing, LocalBeamSearch, TabuSearch])
+@pytest.mark.parametrize("max_evaluations", [0, 1, 7])
+def test_start_and_steps_stay_within_max_evaluations(space, strategy, max_evaluations):
+    engine = SearchEngine(space, SearchBudget(max_evaluations=max_evaluations))
+    result = engine.run(strategy())
+
+    assert engine.evaluations <= max_evaluations
+    if max_evaluations == 0:
+        assert engine.stop_reason == "max_evaluations"
+        assert result == []
@@ -0,0 +1,19 @@
+from bench_search import BENCH_CV
+from job import Job
+from search_space import JobSearchSpace
+
+
+def test_add_jobs_keeps_every_job_without_a_link():
+    space = JobSearchSpace([Job(title="Go developer", link="https://example.com/jobs/1")], BENCH_CV, lazy=True)
+
+    ids = space.add_jobs([
+        Job(title="Python developer"),
+        Job(title="SQL analyst", link=""),
+        Job(title="Rust developer", link="https://example.com/jobs/2"),
+        Job(title="Rust developer", link="https://example.com/jobs/2"),
+        Job(title="Go developer", link="https://example.com/jobs/1"),
+    ])
+
+    assert ids == [1, 2, 3]
+    assert [job.title for job in space.materialize(ids)] == ["Python developer", "SQL analyst", "Rust developer"]
+    assert space.store.id_of(Job()) is None
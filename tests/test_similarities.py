@@ -0,0 +1,76 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import similarities
+from cv_extraction import CVData
+from embedding_cache import EmbeddingCache
+
+
+class FakeModel:
+    def get_sentence_embedding_dimension(self) -> int:
+        return 4
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        vectors = np.array([[len(t), t.count(" "), t.count("a"), 1.0] for t in texts], dtype=np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def slow_model(monkeypatch, tmp_path):
+    # Every caller waits as if the model were still loading, so the singleton getters race.
+    model = FakeModel()
+
+    def get_model():
+        time.sleep(0.05)
+        return model
+
+    caches = []
+
+    def make_cache(model_name, dim):
+        cache = EmbeddingCache(model_name, dim, cache_dir=str(tmp_path))
+        caches.append(cache)
+        return cache
+
+    monkeypatch.setattr(similarities, "get_model", get_model)
+    monkeypatch.setattr(similarities, "EmbeddingCache", make_cache)
+    monkeypatch.setattr(similarities, "_embedding_cache", None)
+    monkeypatch.setattr(similarities, "_embedding_cache_enabled", True)
+    monkeypatch.setattr(similarities, "_skill_vocabulary", None)
+    monkeypatch.setattr(similarities, "_warm_up_thread", None)
+    for name in ("MODEL_DIR", "OFFLINE", "_model"):
+        monkeypatch.setattr(similarities, name, getattr(similarities, name))
+    return caches
+
+
+def test_warm_up_and_scoring_share_one_cache_and_vocabulary(slow_model):
+    vocabularies = []
+
+    def score():
+        scorer = similarities.CVScorer(CVData(raw_text="python data engineer", skills=["python"], experience_years=2))
+        vocabularies.append(scorer.vocabulary)
+        scorer.score(["needs python and sql"], [["python", "sql"]])
+
+    scorers = [threading.Thread(target=score) for _ in range(3)]
+    warm_up = similarities.warm_up()
+    for thread in scorers:
+        thread.start()
+    for thread in scorers + [warm_up]:
+        thread.join()
+
+    assert len(slow_model) == 1
+    assert similarities.get_embedding_cache() is slow_model[0]
+    assert all(vocabulary is similarities.get_skill_vocabulary() for vocabulary in vocabularies)
+
+
+def test_configure_model_drops_cache_and_vocabulary(slow_model):
+    similarities.encode_texts(["some text"])
+    similarities.get_skill_vocabulary()
+    similarities.configure_model("/models/a/../b")
+
+    assert similarities._embedding_cache is None
+    assert similarities._skill_vocabulary is None
+    assert similarities.model_id() == os.path.normcase(os.path.abspath("/models/b"))
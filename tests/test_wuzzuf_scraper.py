@@ -0,0 +1,26 @@
+import wuzzuf_scraper
+from job import Job
+from job_db import JobDatabase
+
+
+def test_batch_labels_persisted(monkeypatch):
+    listings = {
+        "ML engineer": ["https://example.com/jobs/1", "https://example.com/jobs/2"],
+        "data scientist": ["https://example.com/jobs/2"],
+    }
+
+    def fake_listings(job_name, page_limit=1, session=None, stop_when=None, **kwargs):
+        return [Job(title=job_name, job_search=job_name, link=link) for link in listings[job_name]]
+
+    monkeypatch.setattr(wuzzuf_scraper, "scrape_job_listings", fake_listings)
+    monkeypatch.setattr(wuzzuf_scraper, "scrape_job_details", lambda jobs, **kwargs: [])
+
+    with JobDatabase(":memory:") as db:
+        jobs = wuzzuf_scraper.scrape_jobs_batch(["ML engineer", "data  scientist", "ml engineer"], db=db, max_workers=1)
+        labels = {job.link: job.job_search for job in jobs}
+        assert labels["https://example.com/jobs/2"] == "ML engineer | data scientist"
+
+        stored = {job.link: job.job_search for job in db.get_jobs(labels)}
+        assert stored == labels
+        offline = wuzzuf_scraper.scrape_jobs(" ml  ENGINEER ", db=db, offline=True)
+        assert {job.link for job in offline} == set(listings["ML engineer"])